@@ -1,10 +1,10 @@
 """Add counter data to the most popular and meta-relevant raid bosses."""
-from models.database import get_db, RaidBoss, RaidCounter, init_db
+from models.database import SessionLocal, RaidBoss, RaidCounter, init_db
 
 # Initialize database
 init_db()
 
-db = get_db()
+db = SessionLocal()
 
 # Counter data for popular raid bosses
 boss_counters = {
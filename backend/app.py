@@ -1,15 +1,19 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
+from datetime import datetime
 import os
 
 # Load environment variables
 load_dotenv()
 
 # Import models and services
-from models.database import init_db
-from services.scheduler import setup_scheduler, scrape_all_sources
+from models.database import init_db, engine, pool_status
+from services.scheduler import setup_scheduler, scrape_all_sources, submit_scrape, scrape_jobs
+from services.leader_election import scheduler_lease
+from services.response_cache import response_cache
 from routes import news_bp, events_bp, raids_bp, assistant_bp
+from routes.db import init_app
 
 # Create Flask app
 app = Flask(__name__)
@@ -21,6 +25,16 @@ app.register_blueprint(events_bp)
 app.register_blueprint(raids_bp)
 app.register_blueprint(assistant_bp)
 
+# Close each request's database session when the request ends
+init_app(app)
+
+# Boot progress, reported by the health endpoints
+startup = {
+    'started_date': datetime.utcnow(),
+    'initialized': False,
+    'warmup_job': None
+}
+
 
 @app.route('/')
 def index():
@@ -41,13 +55,15 @@ def index():
 
 @app.route('/api/scrape', methods=['POST'])
 def manual_scrape():
-    """Manually trigger scraping of all sources."""
+    """Queue a scrape of all sources and return its job."""
     try:
-        scrape_all_sources()
+        job, created = submit_scrape()
         return jsonify({
             'success': True,
-            'message': 'Scraping completed successfully'
-        })
+            'message': 'Scrape queued' if created else 'Scrape already in progress',
+            'data': job.to_dict(),
+            'status_url': f'/api/scrape/{job.id}'
+        }), 202
     except Exception as e:
         return jsonify({
             'success': False,
@@ -55,15 +71,110 @@ def manual_scrape():
         }), 500
 
 
+@app.route('/api/scrape/<string:job_id>', methods=['GET'])
+def scrape_status(job_id):
+    """Get progress of a scrape job."""
+    job = scrape_jobs.get(job_id)
+
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': f'Scrape job "{job_id}" not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    })
+
+
+def check_readiness():
+    """Report whether the app can serve requests from the database."""
+    checks = {'initialized': startup['initialized']}
+
+    try:
+        with engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+        checks['database'] = True
+    except Exception as e:
+        print(f"Readiness check failed: {e}")
+        checks['database'] = False
+
+    return all(checks.values()), checks
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """Health check endpoint.
+
+    Answers whenever the process is up (liveness) and reports readiness and
+    the warm-up scrape alongside.
+    """
+    ready, checks = check_readiness()
+    warmup_job = startup['warmup_job']
+
     return jsonify({
         'status': 'healthy',
-        'service': 'Pokemon GO News API'
+        'service': 'Pokemon GO News API',
+        'live': True,
+        'ready': ready,
+        'checks': checks,
+        'warmup': {
+            'id': warmup_job.id,
+            'status': warmup_job.status,
+            'stage': warmup_job.progress_snapshot().get('stage')
+        } if warmup_job else None,
+        'started_date': startup['started_date'].isoformat(),
+        'database_pool': pool_status(),
+        'response_cache': response_cache.stats()
     })
 
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: the process is up and answering."""
+    return jsonify({'status': 'alive'})
+
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 until the database is initialized and reachable."""
+    ready, checks = check_readiness()
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'checks': checks
+    }), 200 if ready else 503
+
+
+def run_startup_scrape():
+    """Run the warm-up scrape according to STARTUP_SCRAPE.
+
+    background (default) queues it and serves existing data meanwhile,
+    blocking waits for it before the app starts, and off skips it. Only the
+    scheduler leader scrapes, so extra workers don't repeat it.
+    """
+    mode = os.getenv('STARTUP_SCRAPE', 'background').lower()
+
+    if mode == 'off':
+        print("Startup scrape disabled")
+        return
+    if not scheduler_lease.is_leader:
+        print("Skipping startup scrape: another process holds the scheduler lease")
+        return
+
+    if mode == 'blocking':
+        print("Running initial scrape...")
+        try:
+            scrape_all_sources()
+        except Exception as e:
+            print(f"Initial scrape failed: {e}")
+        return
+
+    job, _ = submit_scrape()
+    startup['warmup_job'] = job
+    print(f"Initial scrape {job.id} queued in the background")
+
+
 def initialize_app():
     """Initialize database and scheduler."""
     print("Initializing database...")
@@ -72,12 +183,8 @@ def initialize_app():
     print("Setting up scheduler...")
     scheduler = setup_scheduler()
 
-    # Run initial scrape
-    print("Running initial scrape...")
-    try:
-        scrape_all_sources()
-    except Exception as e:
-        print(f"Initial scrape failed: {e}")
+    run_startup_scrape()
+    startup['initialized'] = True
 
     return scheduler
 
@@ -0,0 +1,134 @@
+"""Measure how long the backend's modules take to import.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+several times, and the median is reported. The script also checks that
+importing the app doesn't load dependencies that should only be pulled in by
+the code paths using them (the Anthropic SDK, Selenium, BeautifulSoup,
+feedparser), and exits non-zero if it does.
+
+Usage (from the backend directory):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 10 --top 15 --budget-ms 500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'app',
+    'models.database',
+    'routes',
+    'services.scheduler',
+    'services.summarizer',
+    'services.raid_ingestion',
+    'scrapers',
+    'scrapers.leekduck',
+    'scrapers.official_blog',
+    'scrapers.pokebattler'
+]
+
+# Must not be loaded just by importing the app
+LAZY_DEPENDENCIES = ['anthropic', 'selenium', 'webdriver_manager', 'bs4', 'feedparser']
+
+
+def _run(code, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += ['-c', code]
+
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR, PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(cmd, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"`{code}` failed:\n{result.stderr[-2000:]}")
+    return result
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into (name, depth, self_us, cumulative_us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module, runs):
+    """Return (median ms, heaviest imports) for importing module."""
+    totals = []
+    heaviest = {}
+
+    for _ in range(runs):
+        rows = parse_importtime(_run(f'import {module}', importtime=True).stderr)
+        top_level = [row for row in rows if row[0] == module]
+        totals.append(top_level[-1][3] / 1000 if top_level else 0.0)
+
+        # Direct and second-level imports account for most of the time
+        for name, depth, _, cumulative_us in rows:
+            if 0 < depth <= 2:
+                heaviest.setdefault(name, []).append(cumulative_us / 1000)
+
+    heaviest = sorted(
+        ((name, statistics.median(values)) for name, values in heaviest.items()),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    return statistics.median(totals), heaviest
+
+
+def loaded_lazy_dependencies(module):
+    """Return the lazy dependencies that importing module loads."""
+    code = (
+        f'import json, sys, {module}; '
+        f'print(json.dumps([m for m in {LAZY_DEPENDENCIES!r} if m in sys.modules]))'
+    )
+    return json.loads(_run(code).stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='imports per module (median is reported)')
+    parser.add_argument('--top', type=int, default=10, help='heaviest imports to list for the app')
+    parser.add_argument('--budget-ms', type=float, help='fail if importing the app takes longer than this')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    args = parser.parse_args()
+
+    print(f"Import times (median of {args.runs} runs, fresh interpreter each):")
+    app_ms, app_heaviest = None, []
+    for module in args.modules:
+        total_ms, heaviest = measure(module, args.runs)
+        print(f"  {module:<28} {total_ms:8.1f} ms")
+        if module == 'app':
+            app_ms, app_heaviest = total_ms, heaviest
+
+    if app_heaviest:
+        print("\nHeaviest imports under app:")
+        for name, ms in app_heaviest[:args.top]:
+            print(f"  {name:<40} {ms:8.1f} ms")
+
+    failed = False
+
+    eager = loaded_lazy_dependencies('app')
+    if eager:
+        print(f"\nFAIL: importing app loads {', '.join(eager)}; import these where they are used")
+        failed = True
+    else:
+        print(f"\nOK: importing app does not load {', '.join(LAZY_DEPENDENCIES)}")
+
+    if args.budget_ms is not None and app_ms is not None and app_ms > args.budget_ms:
+        print(f"FAIL: importing app took {app_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
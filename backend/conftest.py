@@ -0,0 +1,50 @@
+"""Shared pytest fixtures: throwaway SQLite databases under pytest's temporary directories."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Base
+
+
+def _sqlite_engine(directory, schema=True):
+    engine = create_engine(f"sqlite:///{directory / 'test.db'}")
+    if schema:
+        Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A new SQLite database with the app's tables."""
+    engine = _sqlite_engine(tmp_path)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def empty_engine(tmp_path):
+    """A new SQLite database with no tables."""
+    engine = _sqlite_engine(tmp_path, schema=False)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def module_engine(tmp_path_factory):
+    """A SQLite database with the app's tables, shared by one test module."""
+    engine = _sqlite_engine(tmp_path_factory.mktemp('db'))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    """A session on the engine fixture's database, closed after the test."""
+    session = session_factory()
+    yield session
+    session.close()
@@ -1,3 +1,3 @@
-from .database import db, NewsItem, Event, RaidBoss, RaidCounter, init_db
+from .database import db, NewsItem, Event, RaidBoss, RaidCounter, RaidRefreshEntry, SummaryCacheEntry, SchedulerLease, BackgroundJob, CalendarMonth, DataVersion, SchemaMigration, init_db
 
-__all__ = ['db', 'NewsItem', 'Event', 'RaidBoss', 'RaidCounter', 'init_db']
+__all__ = ['db', 'NewsItem', 'Event', 'RaidBoss', 'RaidCounter', 'RaidRefreshEntry', 'SummaryCacheEntry', 'SchedulerLease', 'BackgroundJob', 'CalendarMonth', 'DataVersion', 'SchemaMigration', 'init_db']
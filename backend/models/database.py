@@ -1,13 +1,24 @@
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.engine import make_url
+from contextlib import contextmanager
 import os
 
+from .pool import MeteredQueuePool
+from .sqlite_tuning import configure_sqlite
+from .full_text_search import install_fts
+
 Base = declarative_base()
 
 class NewsItem(Base):
     __tablename__ = 'news_items'
+    # Match the feed's sort order (newest first, id as tiebreaker), with and without a source filter
+    __table_args__ = (
+        Index('idx_news_published', 'published_date', 'scraped_date', 'id'),
+        Index('idx_news_source_published', 'source', 'published_date', 'scraped_date', 'id'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False)
@@ -33,6 +44,15 @@ class NewsItem(Base):
 
 class Event(Base):
     __tablename__ = 'events'
+    # Listing sort order (optionally filtered by type or source), calendar
+    # month ranges on start_date, upcoming events on end_date, and URL dedup
+    __table_args__ = (
+        Index('uq_event_url', 'url', unique=True),
+        Index('idx_event_start', 'start_date', 'scraped_date', 'id'),
+        Index('idx_event_type_start', 'event_type', 'start_date', 'scraped_date', 'id'),
+        Index('idx_event_source_start', 'source', 'start_date', 'scraped_date', 'id'),
+        Index('idx_event_end', 'end_date'),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False)
@@ -60,9 +80,18 @@ class Event(Base):
         }
 
 
+# Full-text search indexes (SQLite only) for /api/news/search and /api/events/search
+install_fts(NewsItem.__table__)
+install_fts(Event.__table__)
+
+
 class RaidBoss(Base):
     __tablename__ = 'raid_bosses'
-    __table_args__ = (Index('idx_raid_boss_name', 'name'),)
+    __table_args__ = (
+        Index('idx_raid_boss_name', 'name'),
+        Index('idx_raid_boss_tier_name', 'tier', 'name', 'id'),
+        Index('idx_raid_boss_active_tier_name', 'is_active', 'tier', 'name', 'id'),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False, unique=True)
@@ -107,11 +136,16 @@ class RaidBoss(Base):
         }
 
 
+# Case-insensitive lookup by name from the counters route
+Index('idx_raid_boss_name_lower', func.lower(RaidBoss.name))
+
+
 class RaidCounter(Base):
     __tablename__ = 'raid_counters'
     __table_args__ = (
-        Index('idx_raid_counter_boss_id', 'raid_boss_id'),
         Index('idx_raid_counter_rank', 'rank'),
+        # Also serves lookups by raid_boss_id alone
+        Index('idx_raid_counter_boss_rank', 'raid_boss_id', 'rank'),
     )
 
     id = Column(Integer, primary_key=True)
@@ -148,23 +182,142 @@ class RaidCounter(Base):
         }
 
 
+class RaidRefreshEntry(Base):
+    __tablename__ = 'raid_refresh_queue'
+
+    id = Column(Integer, primary_key=True)
+    boss_name = Column(String(100), nullable=False, unique=True)
+    tier = Column(String(20))
+    is_active = Column(Boolean, default=True)
+    hint_url = Column(String(500))
+    request_count = Column(Integer, default=0, nullable=False)
+    last_requested = Column(DateTime)
+    last_attempted = Column(DateTime)
+    discovered_date = Column(DateTime, default=datetime.utcnow)
+
+
+class SummaryCacheEntry(Base):
+    __tablename__ = 'summary_cache'
+    __table_args__ = (Index('idx_summary_cache_last_used', 'last_used_date'),)
+
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), nullable=False, unique=True)
+    kind = Column(String(20), nullable=False)
+    summary = Column(Text, nullable=False)
+    created_date = Column(DateTime, default=datetime.utcnow)
+    last_used_date = Column(DateTime, default=datetime.utcnow)
+
+
+class SchedulerLease(Base):
+    __tablename__ = 'scheduler_leases'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True)
+    holder = Column(String(200))
+    acquired_date = Column(DateTime)
+    heartbeat_date = Column(DateTime)
+    expires_date = Column(DateTime)
+
+
+class BackgroundJob(Base):
+    __tablename__ = 'background_jobs'
+    __table_args__ = (Index('idx_background_job_finished', 'finished_date'),)
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(100), nullable=False)
+    # Set to kind while the job is queued or running, so each kind has at most one active job
+    active_kind = Column(String(100), unique=True)
+    status = Column(String(20), nullable=False)
+    # JSON
+    params = Column(Text)
+    progress = Column(Text)
+    result = Column(Text)
+    error = Column(Text)
+    holder = Column(String(200))
+    created_date = Column(DateTime, default=datetime.utcnow)
+    started_date = Column(DateTime)
+    finished_date = Column(DateTime)
+    heartbeat_date = Column(DateTime)
+
+
+class CalendarMonth(Base):
+    __tablename__ = 'calendar_months'
+
+    year = Column(Integer, primary_key=True, autoincrement=False)
+    month = Column(Integer, primary_key=True, autoincrement=False)
+    # Serialized JSON array of the month's calendar entries
+    payload = Column(Text, nullable=False)
+    event_count = Column(Integer, default=0)
+    built_date = Column(DateTime, default=datetime.utcnow)
+
+
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_date = Column(DateTime, default=datetime.utcnow)
+
+
+class SchemaMigration(Base):
+    __tablename__ = 'schema_migrations'
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(200), nullable=False)
+    applied_date = Column(DateTime, default=datetime.utcnow)
+
+
 # Database setup
 db_url = os.getenv('DATABASE_URL', 'sqlite:///pokemon_go_news.db')
-engine = create_engine(db_url)
+
+
+def _engine_options(url):
+    """Pool settings for create_engine, configurable through the environment."""
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        # In-memory SQLite lives in a single connection; keep SQLAlchemy's default pool
+        return {}
+
+    return {
+        'poolclass': MeteredQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+    }
+
+
+engine = create_engine(db_url, **_engine_options(db_url))
+configure_sqlite(engine)
 SessionLocal = sessionmaker(bind=engine)
 db = SessionLocal
 
 
 def init_db():
-    """Initialize the database, creating all tables."""
-    Base.metadata.create_all(engine)
+    """Initialize the database: create missing tables and apply pending migrations."""
+    from .migrations import migrate
+
+    migrate(engine)
     print("Database initialized successfully!")
 
 
-def get_db():
-    """Get a database session."""
+@contextmanager
+def session_scope():
+    """Provide a session that is committed on success, rolled back on error, and always closed."""
     session = SessionLocal()
     try:
-        return session
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
     finally:
-        pass  # Session will be closed by the caller
+        session.close()
+
+
+def pool_status():
+    """Connection pool usage for health checks."""
+    if isinstance(engine.pool, MeteredQueuePool):
+        return engine.pool.stats()
+    return {'status': engine.pool.status()}
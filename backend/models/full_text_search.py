@@ -0,0 +1,50 @@
+"""SQLite FTS5 indexes over the news and event text.
+
+Each indexed table gets an FTS5 table keyed by the row's id, kept in step
+by triggers, so every write path (ORM, bulk inserts, summarization) is
+covered without application code. Other databases have no FTS tables;
+services.search falls back to LIKE matching there.
+"""
+from sqlalchemy import DDL, event
+
+# Indexed table -> (FTS table, indexed columns, BM25 weight per column)
+FTS_INDEXES = {
+    'news_items': ('news_fts', ['title', 'summary', 'content'], [10.0, 5.0, 1.0]),
+    'events': ('events_fts', ['title', 'summary', 'description'], [10.0, 5.0, 1.0])
+}
+
+# Porter stemming for English text; remove_diacritics lets "pokemon" match "Pokémon"
+FTS_TOKENIZER = 'porter unicode61 remove_diacritics 2'
+
+
+def fts_statements(table_name):
+    """CREATE statements for a table's FTS index and its sync triggers."""
+    fts_table, columns, _ = FTS_INDEXES[table_name]
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({column_list}, tokenize='{FTS_TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT OR REPLACE INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} ON {table_name} BEGIN "
+        f"INSERT OR REPLACE INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table_name} BEGIN "
+        f"DELETE FROM {fts_table} WHERE rowid = old.id; END"
+    ]
+
+
+def backfill_statement(table_name):
+    """Copy one id range of existing rows (:low <= id < :high) into the FTS index."""
+    fts_table, columns, _ = FTS_INDEXES[table_name]
+    column_list = ', '.join(columns)
+    return (
+        f"INSERT OR REPLACE INTO {fts_table}(rowid, {column_list}) "
+        f"SELECT id, {column_list} FROM {table_name} WHERE id >= :low AND id < :high"
+    )
+
+
+def install_fts(table):
+    """Create the FTS index and triggers whenever create_all creates table on SQLite."""
+    for statement in fts_statements(table.name):
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
@@ -0,0 +1,87 @@
+"""Versioned schema and data migrations.
+
+Each migration is a module named vNNNN_<name>.py with an upgrade(engine)
+function, listed in MIGRATIONS below in the order it must run. Applied
+versions are recorded in the schema_migrations table, so every database
+runs each migration once.
+
+A new database is created straight from the models and marked as fully
+migrated. Migrations therefore only have to bring an *existing* database
+up to date, and must be safe to re-run (see operations.py), since two
+workers starting at once may both apply the same one.
+
+Run `python -m models.migrations` from backend/ to apply pending
+migrations, or `python -m models.migrations status` to list them.
+"""
+from importlib import import_module
+
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError
+
+MIGRATIONS = [
+    'v0001_query_indexes',
+    'v0002_full_text_search',
+    'v0003_unique_event_url',
+    'v0004_drop_raid_counter_boss_index',
+]
+
+
+def _load(module_name):
+    module = import_module(f'{__name__}.{module_name}')
+    return int(module_name[1:5]), module
+
+
+def applied_versions(engine):
+    """Versions recorded in schema_migrations."""
+    from ..database import SchemaMigration
+
+    with engine.connect() as connection:
+        return set(connection.execute(select(SchemaMigration.version)).scalars())
+
+
+def _record(engine, version, name):
+    from ..database import SchemaMigration
+
+    try:
+        with engine.begin() as connection:
+            connection.execute(SchemaMigration.__table__.insert().values(version=version, name=name))
+    except IntegrityError:
+        # Another worker applied it at the same time
+        pass
+
+
+def migration_status(engine):
+    """List of (version, name, applied) for every known migration."""
+    applied = applied_versions(engine)
+    return [(version, module.NAME, version in applied) for version, module in map(_load, MIGRATIONS)]
+
+
+def migrate(engine):
+    """Create missing tables and apply pending migrations in order.
+
+    Returns the versions that were applied.
+    """
+    from ..database import Base
+
+    # Any table at all means a database that existed before this run
+    fresh = not inspect(engine).get_table_names()
+
+    # Only adds tables that don't exist yet; existing tables are never altered
+    Base.metadata.create_all(engine)
+
+    migrations = [_load(module_name) for module_name in MIGRATIONS]
+    applied = applied_versions(engine)
+    pending = [(version, module) for version, module in migrations if version not in applied]
+
+    if fresh:
+        # The models already describe the latest schema
+        for version, module in pending:
+            _record(engine, version, module.NAME)
+        return []
+
+    for version, module in pending:
+        print(f"Applying migration {version:04d} {module.NAME}...")
+        module.upgrade(engine)
+        _record(engine, version, module.NAME)
+
+    return [version for version, _ in pending]
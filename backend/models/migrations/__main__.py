@@ -0,0 +1,19 @@
+"""Apply pending migrations, or list them with `status`.
+
+    python -m models.migrations
+    python -m models.migrations status
+"""
+import sys
+
+from ..database import engine
+from . import migrate, migration_status
+
+if len(sys.argv) > 1 and sys.argv[1] == 'status':
+    for version, name, applied in migration_status(engine):
+        print(f"{version:04d} {name:<30} {'applied' if applied else 'pending'}")
+elif len(sys.argv) > 1:
+    print(f"Unknown command: {sys.argv[1]} (expected 'status')")
+    sys.exit(2)
+else:
+    applied = migrate(engine)
+    print(f"\n✓ Applied {len(applied)} migration(s)")
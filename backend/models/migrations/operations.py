@@ -0,0 +1,154 @@
+"""Building blocks for migrations that can run while the app is serving.
+
+Every operation here is safe to repeat: a migration that was interrupted
+(or raced by another worker starting at the same time) is simply run again.
+"""
+import os
+import time
+
+from sqlalchemy import func, inspect, select, text, update
+from sqlalchemy.schema import CreateIndex
+
+
+def existing_indexes(connection, table_name):
+    """Index names on a table, read from the catalog (reflection skips expression indexes)."""
+    if connection.dialect.name == 'sqlite':
+        query = text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table")
+    elif connection.dialect.name == 'postgresql':
+        query = text("SELECT indexname FROM pg_indexes WHERE tablename = :table")
+    else:
+        return {index['name'] for index in inspect(connection).get_indexes(table_name)}
+    return set(connection.execute(query, {'table': table_name}).scalars())
+
+
+def create_index(engine, index):
+    """Build an index if it is missing. Returns True if it was created.
+
+    On PostgreSQL the index is built CONCURRENTLY so writes to the table
+    carry on during the build. SQLite has no such option, but its builds
+    are short and readers are not blocked in WAL mode.
+    """
+    with engine.connect() as connection:
+        if index.name in existing_indexes(connection, index.table.name):
+            return False
+
+    if engine.dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.execute(CreateIndex(index, if_not_exists=True, postgresql_concurrently=True))
+    else:
+        with engine.begin() as connection:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+    return True
+
+
+def drop_index(engine, table_name, index_name):
+    """Drop an index if it exists. Returns True if it was dropped.
+
+    On PostgreSQL the index is dropped CONCURRENTLY so queries on the table
+    aren't blocked while it goes.
+    """
+    with engine.connect() as connection:
+        if index_name not in existing_indexes(connection, table_name):
+            return False
+        quoted = connection.dialect.identifier_preparer.quote(index_name)
+
+    if engine.dialect.name == 'postgresql':
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS {quoted}')
+    else:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'DROP INDEX IF EXISTS {quoted}')
+    return True
+
+
+def add_column(engine, table, column_name):
+    """Add a column declared on a model to the existing table. Returns True if it was added.
+
+    The column must be nullable (or have a server default) so that adding it
+    is a metadata-only change rather than a table rebuild; fill it in
+    afterwards with update_in_batches.
+    """
+    columns = {column['name'] for column in inspect(engine).get_columns(table.name)}
+    if column_name in columns:
+        return False
+
+    column = table.c[column_name]
+    with engine.begin() as connection:
+        preparer = connection.dialect.identifier_preparer
+        column_type = column.type.compile(dialect=connection.dialect)
+        ddl = f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}'
+        if column.server_default is not None:
+            ddl += f' DEFAULT {column.server_default.arg}'
+        connection.exec_driver_sql(ddl)
+    return True
+
+
+def update_in_batches(engine, table, compute, columns, where=None, batch_size=None, pause=None):
+    """Rewrite rows a batch at a time, committing after each batch.
+
+    compute(row) returns a dict of new values for the row, or None to leave
+    it alone. Rows are walked in primary key order, and each batch is its
+    own short transaction, so the app keeps reading and writing the table
+    while a large backfill runs. where narrows the rows to visit (e.g. only
+    those still missing a value), which also lets an interrupted backfill
+    pick up where it stopped. Returns the number of rows updated.
+    """
+    batch_size = batch_size or int(os.getenv('MIGRATION_BATCH_SIZE', 1000))
+    pause = pause if pause is not None else float(os.getenv('MIGRATION_BATCH_PAUSE', 0.05))
+    key = table.primary_key.columns.values()[0]
+
+    query = select(key, *columns).order_by(key).limit(batch_size)
+    if where is not None:
+        query = query.where(where)
+
+    last_key = None
+    updated = 0
+    while True:
+        with engine.begin() as connection:
+            batch_query = query if last_key is None else query.where(key > last_key)
+            rows = connection.execute(batch_query).all()
+            if not rows:
+                break
+
+            for row in rows:
+                values = compute(row)
+                if values:
+                    connection.execute(update(table).where(key == row[0]).values(**values))
+                    updated += 1
+            last_key = rows[-1][0]
+
+        if len(rows) < batch_size:
+            break
+        # Give other writers a turn between batches
+        time.sleep(pause)
+
+    return updated
+
+
+def execute_in_id_ranges(engine, table, statement, batch_size=None, pause=None):
+    """Run statement once per primary key range, committing after each range.
+
+    statement is SQL taking :low and :high bounds (low inclusive, high
+    exclusive), e.g. an INSERT ... SELECT that copies rows into a derived
+    table. Like update_in_batches, each range is a short transaction.
+    Returns the number of ranges run.
+    """
+    batch_size = batch_size or int(os.getenv('MIGRATION_BATCH_SIZE', 1000))
+    pause = pause if pause is not None else float(os.getenv('MIGRATION_BATCH_PAUSE', 0.05))
+    key = table.primary_key.columns.values()[0]
+
+    with engine.connect() as connection:
+        low, high = connection.execute(select(func.min(key), func.max(key))).one()
+    if low is None:
+        return 0
+
+    ranges = 0
+    for start in range(low, high + 1, batch_size):
+        with engine.begin() as connection:
+            connection.execute(text(statement), {'low': start, 'high': start + batch_size})
+        ranges += 1
+        if start + batch_size <= high:
+            time.sleep(pause)
+
+    return ranges
@@ -0,0 +1,32 @@
+"""Composite indexes for the listing, calendar and counters queries."""
+from sqlalchemy import inspect, text
+
+from ..database import NewsItem, Event, RaidBoss, RaidCounter
+from .operations import create_index
+
+NAME = 'query_indexes'
+
+TABLES = [NewsItem.__table__, Event.__table__, RaidBoss.__table__, RaidCounter.__table__]
+
+# Named explicitly so indexes added to the models later (and the data
+# clean-up they may need) stay with their own migrations
+INDEXES = {
+    'idx_news_published', 'idx_news_source_published',
+    'idx_event_start', 'idx_event_type_start', 'idx_event_source_start', 'idx_event_end',
+    'idx_raid_boss_tier_name', 'idx_raid_boss_active_tier_name', 'idx_raid_boss_name_lower',
+    'idx_raid_counter_boss_rank'
+}
+
+
+def upgrade(engine):
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in TABLES:
+        if table.name not in existing_tables:
+            continue
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name in INDEXES and create_index(engine, index):
+                print(f"  Created {index.name} on {table.name}")
+
+    # Let the planner see the new indexes' selectivity
+    with engine.begin() as connection:
+        connection.execute(text('ANALYZE'))
@@ -0,0 +1,22 @@
+"""FTS5 search indexes for news and events, filled from the existing rows."""
+from ..database import NewsItem, Event
+from ..full_text_search import fts_statements, backfill_statement
+from .operations import execute_in_id_ranges
+
+NAME = 'full_text_search'
+
+TABLES = [NewsItem.__table__, Event.__table__]
+
+
+def upgrade(engine):
+    if engine.dialect.name != 'sqlite':
+        return
+
+    for table in TABLES:
+        # Triggers first, so rows written during the backfill are indexed too
+        with engine.begin() as connection:
+            for statement in fts_statements(table.name):
+                connection.exec_driver_sql(statement)
+
+        ranges = execute_in_id_ranges(engine, table, backfill_statement(table.name))
+        print(f"  Indexed {table.name} for full-text search in {ranges} batch(es)")
@@ -0,0 +1,29 @@
+"""Make events.url unique so concurrent scrapes can't store the same event twice."""
+from sqlalchemy import inspect, text
+
+from ..database import Event
+from .operations import create_index, drop_index
+
+NAME = 'unique_event_url'
+
+
+def upgrade(engine):
+    if not inspect(engine).has_table(Event.__tablename__):
+        return
+
+    # Keep the first copy of each event; the unique index can't be built over duplicates
+    with engine.begin() as connection:
+        removed = connection.execute(text(
+            "DELETE FROM events WHERE url IS NOT NULL AND id NOT IN "
+            "(SELECT MIN(id) FROM events WHERE url IS NOT NULL GROUP BY url)"
+        )).rowcount
+    if removed:
+        print(f"  Removed {removed} duplicate event(s)")
+
+    index = next(index for index in Event.__table__.indexes if index.name == 'uq_event_url')
+    if create_index(engine, index):
+        print("  Created uq_event_url on events")
+
+    # The unique index serves the URL lookups the plain one was for
+    if drop_index(engine, Event.__tablename__, 'idx_event_url'):
+        print("  Dropped idx_event_url on events")
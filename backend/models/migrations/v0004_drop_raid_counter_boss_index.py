@@ -0,0 +1,12 @@
+"""Drop idx_raid_counter_boss_id, a leftmost prefix of idx_raid_counter_boss_rank."""
+from ..database import RaidCounter
+from .operations import drop_index
+
+NAME = 'drop_raid_counter_boss_index'
+
+
+def upgrade(engine):
+    # Lookups by raid_boss_id use idx_raid_counter_boss_rank (raid_boss_id, rank);
+    # the single-column index only cost writes
+    if drop_index(engine, RaidCounter.__tablename__, 'idx_raid_counter_boss_id'):
+        print("  Dropped idx_raid_counter_boss_id on raid_counters")
@@ -0,0 +1,52 @@
+"""Connection pool that keeps checkout and wait-time metrics."""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how often and how long callers wait for a connection.
+
+    Long or frequent waits (and timeouts) mean the pool is too small for the
+    load, or that something is holding connections for too long.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._metrics_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def stats(self):
+        """Snapshot of pool usage as a JSON-friendly dict."""
+        with self._metrics_lock:
+            return {
+                'size': self.size(),
+                'checked_out': self.checkedout(),
+                'idle': self.checkedin(),
+                'overflow': max(self.overflow(), 0),
+                'max_overflow': self._max_overflow,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 2)
+            }
@@ -0,0 +1,88 @@
+"""SQLite connection pragmas and periodic maintenance."""
+import os
+
+from sqlalchemy import event
+
+
+def sqlite_pragmas():
+    """Pragmas applied to every new SQLite connection, configurable through the environment."""
+    return [
+        # First, so the pragmas below wait out a writer instead of failing
+        ('busy_timeout', int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))),
+        # Only applied to a new, empty database file (see apply_pragmas)
+        ('auto_vacuum', 'INCREMENTAL'),
+        # WAL lets readers keep going while the scheduler writes
+        ('journal_mode', os.getenv('SQLITE_JOURNAL_MODE', 'WAL')),
+        # NORMAL is safe in WAL mode; only the last commits can be lost on power failure
+        ('synchronous', os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')),
+        ('cache_size', -int(os.getenv('SQLITE_CACHE_SIZE_KB', 65536))),
+        ('mmap_size', int(os.getenv('SQLITE_MMAP_SIZE', 268435456))),
+        ('temp_store', 'MEMORY')
+    ]
+
+
+def is_file_sqlite(engine):
+    """True for an on-disk SQLite database."""
+    return engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:')
+
+
+def configure_sqlite(engine):
+    """Apply the pragmas whenever the engine opens a SQLite connection."""
+    if not is_file_sqlite(engine):
+        return
+
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                # These two are stored in the database file and need a lock to
+                # change, so leave them alone unless there is something to do
+                if name == 'journal_mode':
+                    cursor.execute('PRAGMA journal_mode')
+                    if cursor.fetchone()[0].lower() == str(value).lower():
+                        continue
+                elif name == 'auto_vacuum':
+                    cursor.execute('PRAGMA page_count')
+                    if cursor.fetchone()[0] > 0:
+                        continue
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def run_sqlite_maintenance(engine, vacuum_pages=None):
+    """Refresh query planner statistics, return free pages to the OS and checkpoint the WAL.
+
+    Returns a dict describing what was done, or None for non-SQLite databases.
+    """
+    if not is_file_sqlite(engine):
+        return None
+
+    vacuum_pages = vacuum_pages or int(os.getenv('SQLITE_VACUUM_PAGES', 1000))
+    report = {}
+
+    with engine.connect() as connection:
+        connection.exec_driver_sql('PRAGMA optimize')
+        report['optimized'] = True
+
+        freelist = connection.exec_driver_sql('PRAGMA freelist_count').scalar()
+        auto_vacuum = connection.exec_driver_sql('PRAGMA auto_vacuum').scalar()
+        report['free_pages'] = freelist
+
+        # 2 = INCREMENTAL; older databases created without it can't be shrunk this way
+        if auto_vacuum == 2 and freelist:
+            # The sqlite3 module steps a statement that returns no rows only
+            # once, and each step of incremental_vacuum frees a single page
+            for _ in range(min(freelist, vacuum_pages)):
+                connection.exec_driver_sql('PRAGMA incremental_vacuum(1)')
+            report['vacuumed_pages'] = freelist - connection.exec_driver_sql('PRAGMA freelist_count').scalar()
+
+        busy, wal_pages, checkpointed = connection.exec_driver_sql('PRAGMA wal_checkpoint(PASSIVE)').one()
+        report['wal_pages'] = wal_pages
+        report['checkpointed_pages'] = checkpointed
+        connection.commit()
+
+    return report
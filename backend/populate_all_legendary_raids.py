@@ -1,11 +1,11 @@
 """Populate database with comprehensive legendary raid bosses from Pokebattler."""
-from models.database import get_db, RaidBoss, RaidCounter, init_db
+from models.database import SessionLocal, RaidBoss, RaidCounter, init_db
 from datetime import datetime
 
 # Initialize database
 init_db()
 
-db = get_db()
+db = SessionLocal()
 
 # Comprehensive list of Tier 5 legendary raid bosses
 legendary_raids = [
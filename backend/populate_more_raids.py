@@ -1,11 +1,11 @@
 """Add more raid bosses to the database."""
-from models.database import get_db, RaidBoss, RaidCounter, init_db
+from models.database import SessionLocal, RaidBoss, RaidCounter, init_db
 from datetime import datetime
 
 # Initialize database
 init_db()
 
-db = get_db()
+db = SessionLocal()
 
 # Additional raid bosses
 additional_raids = [
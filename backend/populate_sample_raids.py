@@ -1,11 +1,11 @@
 """Populate database with sample raid data for testing."""
-from models.database import get_db, RaidBoss, RaidCounter, init_db
+from models.database import SessionLocal, RaidBoss, RaidCounter, init_db
 from datetime import datetime
 
 # Initialize database
 init_db()
 
-db = get_db()
+db = SessionLocal()
 
 # Sample raid bosses based on current Pokemon GO raids
 sample_raids = [
@@ -0,0 +1,29 @@
+"""Database sessions scoped to a request."""
+from flask import g
+
+from models.database import SessionLocal
+
+
+def get_db():
+    """The current request's database session.
+
+    It is created on first use and closed when the request ends (see
+    init_app), so routes don't close it themselves.
+    """
+    if 'db' not in g:
+        g.db = SessionLocal()
+    return g.db
+
+
+def init_app(app):
+    """Close each request's session when its app context ends, even on errors."""
+    @app.teardown_appcontext
+    def close_request_db(exception=None):
+        session = g.pop('db', None)
+        if session is None:
+            return
+        try:
+            if exception is not None:
+                session.rollback()
+        finally:
+            session.close()
@@ -1,66 +1,116 @@
-from flask import Blueprint, jsonify, request
-from models.database import get_db, Event
-from datetime import datetime, timedelta
+from flask import Blueprint, Response, jsonify, request
+from models.database import Event
+from routes.db import get_db
+from services.pagination import paginate_listing, InvalidCursor
+from services.search import search
+from services.calendar_store import build_calendar_query, get_month_json
+from services.data_version import EVENTS
+from services.response_cache import cached_response
+from datetime import datetime
 
 events_bp = Blueprint('events', __name__, url_prefix='/api/events')
 
+# Latest start first; id breaks ties so every row has a unique position
+EVENT_SORT_KEYS = [
+    (Event.start_date, True),
+    (Event.scraped_date, True),
+    (Event.id, True)
+]
+
+
+def event_filters(args):
+    """Type, source and date range conditions shared by the listing and search endpoints."""
+    event_type = args.get('type', None)
+    source = args.get('source', None)
+    start_date = args.get('start_date', None)
+    end_date = args.get('end_date', None)
+
+    filters = []
+
+    # Filter by event type if provided
+    if event_type:
+        filters.append(Event.event_type == event_type)
+
+    # Filter by source if provided
+    if source:
+        filters.append(Event.source == source)
+
+    # Filter by date range if provided
+    if start_date:
+        try:
+            start = datetime.fromisoformat(start_date)
+            filters.append(Event.start_date >= start)
+        except ValueError:
+            pass
+
+    if end_date:
+        try:
+            end = datetime.fromisoformat(end_date)
+            filters.append(Event.end_date <= end)
+        except ValueError:
+            pass
+
+    return filters
+
+
+def build_events_query(db, args):
+    """Filtered (unordered) events query for the listing endpoint, plus its count cache key."""
+    query = db.query(Event).filter(*event_filters(args))
+    cache_key = ('events', args.get('type'), args.get('source'), args.get('start_date'), args.get('end_date'))
+    return query, cache_key
+
 
 @events_bp.route('/', methods=['GET'])
+@cached_response(EVENTS)
 def get_all_events():
-    """Get all events with optional filtering."""
+    """Get events with optional filtering.
+
+    Pass the returned next_cursor/prev_cursor as ?cursor= to page through
+    the list (add include_total=true for a total). ?page=N still works.
+    """
     try:
         db = get_db()
 
-        # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
-        event_type = request.args.get('type', None)
-        source = request.args.get('source', None)
-        start_date = request.args.get('start_date', None)
-        end_date = request.args.get('end_date', None)
-
-        # Build query
-        query = db.query(Event).order_by(Event.start_date.desc(), Event.scraped_date.desc())
-
-        # Filter by event type if provided
-        if event_type:
-            query = query.filter_by(event_type=event_type)
-
-        # Filter by source if provided
-        if source:
-            query = query.filter_by(source=source)
-
-        # Filter by date range if provided
-        if start_date:
-            try:
-                start = datetime.fromisoformat(start_date)
-                query = query.filter(Event.start_date >= start)
-            except ValueError:
-                pass
-
-        if end_date:
-            try:
-                end = datetime.fromisoformat(end_date)
-                query = query.filter(Event.end_date <= end)
-            except ValueError:
-                pass
-
-        # Pagination
-        total = query.count()
-        offset = (page - 1) * per_page
-        events = query.limit(per_page).offset(offset).all()
-
-        db.close()
+        query, cache_key = build_events_query(db, request.args)
+        events, pagination = paginate_listing(query, EVENT_SORT_KEYS, request.args, cache_key, 50)
 
         return jsonify({
             'success': True,
             'data': [event.to_dict() for event in events],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'pages': (total + per_page - 1) // per_page
-            }
+            'pagination': pagination
+        })
+
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@events_bp.route('/search', methods=['GET'])
+def search_events():
+    """Full-text search of event titles, summaries and descriptions.
+
+    ?q= is required; every word must match and the last may be a prefix.
+    Takes the listing's ?type=, ?source=, ?start_date= and ?end_date=
+    filters plus ?page= and ?per_page=. Each result carries a highlighted
+    HTML snippet and a relevance score, best match first.
+    """
+    try:
+        db = get_db()
+
+        results, pagination = search(db, Event, request.args, event_filters(request.args))
+
+        return jsonify({
+            'success': True,
+            'data': [{**event.to_dict(), 'snippet': snippet, 'relevance': relevance} for event, snippet, relevance in results],
+            'pagination': pagination
         })
 
     except Exception as e:
@@ -76,7 +126,6 @@ def get_event(event_id):
     try:
         db = get_db()
         event = db.query(Event).filter_by(id=event_id).first()
-        db.close()
 
         if not event:
             return jsonify({
@@ -97,48 +146,31 @@ def get_event(event_id):
 
 
 @events_bp.route('/calendar', methods=['GET'])
+@cached_response(EVENTS)
 def get_calendar_events():
-    """Get events formatted for calendar view."""
+    """Get events formatted for calendar view.
+
+    Includes events that started in an earlier month and are still
+    running. Served from the month's precomputed snapshot.
+    """
     try:
         db = get_db()
 
-        # Get query parameters for date range (default to current month)
-        month = request.args.get('month', datetime.now().month, type=int)
-        year = request.args.get('year', datetime.now().year, type=int)
-
-        # Calculate start and end of month
-        start_of_month = datetime(year, month, 1)
-        if month == 12:
-            end_of_month = datetime(year + 1, 1, 1) - timedelta(seconds=1)
-        else:
-            end_of_month = datetime(year, month + 1, 1) - timedelta(seconds=1)
-
-        # Query events in the month
-        events = db.query(Event).filter(
-            Event.start_date >= start_of_month,
-            Event.start_date <= end_of_month
-        ).order_by(Event.start_date).all()
-
-        db.close()
-
-        # Format for calendar
-        calendar_events = []
-        for event in events:
-            calendar_events.append({
-                'id': event.id,
-                'title': event.title,
-                'start': event.start_date.isoformat() if event.start_date else None,
-                'end': event.end_date.isoformat() if event.end_date else None,
-                'type': event.event_type,
-                'summary': event.summary,
-                'url': event.url,
-                'source': event.source
-            })
+        # Get query parameters for date range (default to current month, in
+        # UTC like the snapshot windows)
+        today = datetime.utcnow()
+        month = request.args.get('month', today.month, type=int)
+        year = request.args.get('year', today.year, type=int)
 
-        return jsonify({
-            'success': True,
-            'data': calendar_events
-        })
+        if not 1 <= month <= 12 or not 1 <= year <= 9998:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid month or year'
+            }), 400
+
+        # The entries are already serialized; splice them in as-is
+        payload = get_month_json(db, year, month)
+        return Response(f'{{"success":true,"data":{payload}}}', mimetype='application/json')
 
     except Exception as e:
         return jsonify({
@@ -153,7 +185,6 @@ def get_event_types():
     try:
         db = get_db()
         types = db.query(Event.event_type).distinct().all()
-        db.close()
 
         return jsonify({
             'success': True,
@@ -1,44 +1,113 @@
 from flask import Blueprint, jsonify, request
-from models.database import get_db, NewsItem
+from models.database import NewsItem
+from routes.db import get_db
+from services.pagination import paginate_listing, InvalidCursor
+from services.search import search
+from services.data_version import NEWS
+from services.response_cache import cached_response
 from datetime import datetime
 
 news_bp = Blueprint('news', __name__, url_prefix='/api/news')
 
+# Newest first; id breaks ties so every row has a unique position
+NEWS_SORT_KEYS = [
+    (NewsItem.published_date, True),
+    (NewsItem.scraped_date, True),
+    (NewsItem.id, True)
+]
+
+
+def build_news_query(db, args):
+    """Filtered (unordered) news query for the listing endpoint, plus its count cache key."""
+    source = args.get('source', None)
+
+    query = db.query(NewsItem)
+
+    # Filter by source if provided
+    if source:
+        query = query.filter_by(source=source)
+
+    return query, ('news', source)
+
+
+def news_search_filters(args):
+    """Source and published date range conditions for news search."""
+    source = args.get('source', None)
+    start_date = args.get('start_date', None)
+    end_date = args.get('end_date', None)
+
+    filters = []
+
+    if source:
+        filters.append(NewsItem.source == source)
+
+    if start_date:
+        try:
+            filters.append(NewsItem.published_date >= datetime.fromisoformat(start_date))
+        except ValueError:
+            pass
+
+    if end_date:
+        try:
+            filters.append(NewsItem.published_date <= datetime.fromisoformat(end_date))
+        except ValueError:
+            pass
+
+    return filters
+
 
 @news_bp.route('/', methods=['GET'])
+@cached_response(NEWS)
 def get_all_news():
-    """Get all news items with optional pagination."""
+    """Get news items, newest first.
+
+    Pass the returned next_cursor/prev_cursor as ?cursor= to page through
+    the feed (add include_total=true for a total). ?page=N still works.
+    """
     try:
         db = get_db()
 
-        # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-        source = request.args.get('source', None)
+        query, cache_key = build_news_query(db, request.args)
+        news_items, pagination = paginate_listing(query, NEWS_SORT_KEYS, request.args, cache_key, 20)
+
+        return jsonify({
+            'success': True,
+            'data': [item.to_dict() for item in news_items],
+            'pagination': pagination
+        })
+
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
 
-        # Build query
-        query = db.query(NewsItem).order_by(NewsItem.published_date.desc(), NewsItem.scraped_date.desc())
 
-        # Filter by source if provided
-        if source:
-            query = query.filter_by(source=source)
+@news_bp.route('/search', methods=['GET'])
+def search_news():
+    """Full-text search of news titles, summaries and content.
 
-        # Pagination
-        total = query.count()
-        offset = (page - 1) * per_page
-        news_items = query.limit(per_page).offset(offset).all()
+    ?q= is required; every word must match and the last may be a prefix.
+    Optional ?source=, ?start_date= / ?end_date= (ISO, on the published
+    date), ?page= and ?per_page=. Each result carries a highlighted HTML
+    snippet and a relevance score, best match first.
+    """
+    try:
+        db = get_db()
 
-        db.close()
+        filters = news_search_filters(request.args)
+        results, pagination = search(db, NewsItem, request.args, filters)
 
         return jsonify({
             'success': True,
-            'data': [item.to_dict() for item in news_items],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'pages': (total + per_page - 1) // per_page
-            }
+            'data': [{**item.to_dict(), 'snippet': snippet, 'relevance': relevance} for item, snippet, relevance in results],
+            'pagination': pagination
         })
 
     except Exception as e:
@@ -54,7 +123,6 @@ def get_news_item(news_id):
     try:
         db = get_db()
         news_item = db.query(NewsItem).filter_by(id=news_id).first()
-        db.close()
 
         if not news_item:
             return jsonify({
@@ -80,7 +148,6 @@ def get_sources():
     try:
         db = get_db()
         sources = db.query(NewsItem.source).distinct().all()
-        db.close()
 
         return jsonify({
             'success': True,
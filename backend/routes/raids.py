@@ -1,53 +1,70 @@
-from flask import Blueprint, jsonify, request
-from models.database import get_db, RaidBoss, RaidCounter
-from scrapers.pokebattler import PokebattlerScraper
-from datetime import datetime
+from flask import Blueprint, jsonify, request, g
+from sqlalchemy import func
+from models.database import RaidBoss, RaidCounter
+from routes.db import get_db
+from services.raid_refresh_queue import request_tally
+from services.raid_ingestion import raid_ingestion
+from services.boss_index import boss_index
+from services.pagination import paginate_listing, InvalidCursor
+from services.data_version import RAIDS
+from services.response_cache import cached_response
 
 raids_bp = Blueprint('raids', __name__, url_prefix='/api/raids')
 
+# By tier, then name; id breaks ties so every row has a unique position
+RAID_SORT_KEYS = [
+    (RaidBoss.tier, False),
+    (RaidBoss.name, False),
+    (RaidBoss.id, False)
+]
 
-@raids_bp.route('/', methods=['GET'])
-def get_all_raids():
-    """Get all raid bosses with optional filtering and pagination."""
-    try:
-        db = get_db()
 
-        # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
-        tier = request.args.get('tier', None)
-        active = request.args.get('active', None)
+def build_raids_query(db, args):
+    """Filtered (unordered) raid boss query for the listing endpoint, plus its count cache key."""
+    tier = args.get('tier', None)
+    active = args.get('active', None)
 
-        # Build query
-        query = db.query(RaidBoss).order_by(RaidBoss.tier, RaidBoss.name)
+    query = db.query(RaidBoss)
 
-        # Filter by tier if provided
-        if tier:
-            query = query.filter_by(tier=tier)
+    # Filter by tier if provided
+    if tier:
+        query = query.filter_by(tier=tier)
 
-        # Filter by active status if provided
-        if active is not None:
-            is_active = active.lower() == 'true'
-            query = query.filter_by(is_active=is_active)
+    # Filter by active status if provided
+    is_active = None
+    if active is not None:
+        is_active = active.lower() == 'true'
+        query = query.filter_by(is_active=is_active)
 
-        # Pagination
-        total = query.count()
-        offset = (page - 1) * per_page
-        raid_bosses = query.limit(per_page).offset(offset).all()
+    return query, ('raids', tier, is_active)
 
-        db.close()
+
+@raids_bp.route('/', methods=['GET'])
+@cached_response(RAIDS)
+def get_all_raids():
+    """Get raid bosses with optional filtering.
+
+    Pass the returned next_cursor/prev_cursor as ?cursor= to page through
+    the list (add include_total=true for a total). ?page=N still works.
+    """
+    try:
+        db = get_db()
+
+        query, cache_key = build_raids_query(db, request.args)
+        raid_bosses, pagination = paginate_listing(query, RAID_SORT_KEYS, request.args, cache_key, 50)
 
         return jsonify({
             'success': True,
             'data': [boss.to_dict() for boss in raid_bosses],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total,
-                'pages': (total + per_page - 1) // per_page
-            }
+            'pagination': pagination
         })
 
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
     except Exception as e:
         return jsonify({
             'success': False,
@@ -55,52 +72,90 @@ def get_all_raids():
         }), 500
 
 
+def find_raid_boss(db, boss_name):
+    """Resolve a requested boss name to a raid boss. Returns (boss, match) or (None, None).
+
+    An exact case-insensitive match is one indexed query (on
+    idx_raid_boss_name_lower). Otherwise the name index resolves other
+    spellings and typos ("Giratina-Origin", "Girtina") to the boss id.
+    match is 'exact', 'normalized' or 'fuzzy'.
+    """
+    raid_boss = db.query(RaidBoss).filter(
+        func.lower(RaidBoss.name) == boss_name.lower()
+    ).first()
+    if raid_boss:
+        return raid_boss, 'exact'
+
+    boss_index.ensure_loaded(db)
+    resolved = boss_index.resolve(boss_name)
+    if not resolved:
+        return None, None
+
+    boss, match = resolved
+    raid_boss = db.get(RaidBoss, boss['id'])
+    return (raid_boss, match) if raid_boss else (None, None)
+
+
+def build_counters_query(db, raid_boss_id, args):
+    """Counters for a boss in rank order, filtered by the include_* request args."""
+    include_shadow = args.get('include_shadow', 'true').lower() == 'true'
+    include_mega = args.get('include_mega', 'true').lower() == 'true'
+    include_legendary = args.get('include_legendary', 'true').lower() == 'true'
+
+    counters_query = db.query(RaidCounter).filter_by(
+        raid_boss_id=raid_boss_id
+    ).order_by(RaidCounter.rank)
+
+    # Apply filters
+    if not include_shadow:
+        counters_query = counters_query.filter_by(is_shadow=False)
+    if not include_mega:
+        counters_query = counters_query.filter_by(is_mega=False)
+    if not include_legendary:
+        counters_query = counters_query.filter_by(is_legendary=False)
+
+    return counters_query
+
+
 @raids_bp.route('/<string:boss_name>/counters', methods=['GET'])
+@cached_response(RAIDS, on_hit=request_tally.add)
 def get_boss_counters(boss_name):
-    """Get counters for a specific raid boss."""
+    """Get counters for a specific raid boss.
+
+    The name may be spelled differently from the stored one or have a
+    typo; the response's canonical_name is the boss that was matched.
+    """
     try:
         db = get_db()
 
         # Get query parameters
         limit = request.args.get('limit', 20, type=int)
-        include_shadow = request.args.get('include_shadow', 'true').lower() == 'true'
-        include_mega = request.args.get('include_mega', 'true').lower() == 'true'
-        include_legendary = request.args.get('include_legendary', 'true').lower() == 'true'
 
-        # Find the raid boss (case-insensitive search)
-        raid_boss = db.query(RaidBoss).filter(
-            RaidBoss.name.ilike(boss_name)
-        ).first()
+        # Find the raid boss, tolerating other spellings and typos
+        raid_boss, match = find_raid_boss(db, boss_name)
 
         if not raid_boss:
-            db.close()
             return jsonify({
                 'success': False,
                 'error': f'Raid boss "{boss_name}" not found'
             }), 404
 
-        # Build counters query
-        counters_query = db.query(RaidCounter).filter_by(
-            raid_boss_id=raid_boss.id
-        ).order_by(RaidCounter.rank)
-
-        # Apply filters
-        if not include_shadow:
-            counters_query = counters_query.filter_by(is_shadow=False)
-        if not include_mega:
-            counters_query = counters_query.filter_by(is_mega=False)
-        if not include_legendary:
-            counters_query = counters_query.filter_by(is_legendary=False)
-
         # Limit results
-        counters = counters_query.limit(limit).all()
+        counters = build_counters_query(db, raid_boss.id, request.args).limit(limit).all()
 
-        db.close()
+        # Popular bosses get their counters refreshed sooner; cached
+        # responses count too, via the tag
+        g.response_cache_tag = raid_boss.name
+        request_tally.add(raid_boss.name)
 
         return jsonify({
             'success': True,
             'data': {
                 'boss': raid_boss.to_dict(),
+                # Clients can cache the canonical name instead of retrying spellings
+                'canonical_name': raid_boss.name,
+                'requested_name': boss_name,
+                'match': match,
                 'counters': [counter.to_dict() for counter in counters]
             }
         })
@@ -122,27 +177,14 @@ def search_raid_bosses():
         query_str = request.args.get('q', '').strip()
 
         if not query_str:
-            db.close()
             return jsonify({
                 'success': True,
                 'data': []
             })
 
-        # Search for matching raid bosses (case-insensitive)
-        raid_bosses = db.query(RaidBoss).filter(
-            RaidBoss.name.ilike(f'%{query_str}%')
-        ).order_by(RaidBoss.is_active.desc(), RaidBoss.name).limit(10).all()
-
-        db.close()
-
-        # Return simplified data for autocomplete
-        results = [{
-            'id': boss.id,
-            'name': boss.name,
-            'tier': boss.tier,
-            'is_active': boss.is_active,
-            'types': boss.types.split(',') if boss.types else []
-        } for boss in raid_bosses]
+        # Served from the in-memory name index, not the database
+        boss_index.ensure_loaded(db)
+        results = boss_index.search(query_str, limit=10)
 
         return jsonify({
             'success': True,
@@ -158,86 +200,51 @@ def search_raid_bosses():
 
 @raids_bp.route('/refresh', methods=['POST'])
 def refresh_raid_data():
-    """Manually trigger a refresh of raid data from Pokebattler."""
+    """Queue a refresh of raid data from Pokebattler and return its job."""
     try:
-        db = get_db()
-
-        # Initialize scraper
-        scraper = PokebattlerScraper()
-
-        # Scrape all raids and counters
-        print("Starting manual raid data refresh...")
-        raid_data = scraper.scrape_all_raids_and_counters()
-
-        updated_count = 0
-        added_count = 0
-
-        # Process each raid boss and its counters
-        for raid_entry in raid_data:
-            boss_data = raid_entry.get('boss_data', {})
-            counters_data = raid_entry.get('counters', [])
-
-            if not boss_data.get('name'):
-                continue
-
-            # Check if raid boss already exists
-            existing_boss = db.query(RaidBoss).filter_by(name=boss_data['name']).first()
+        # Re-read the boss list too, since someone asked for fresh data
+        job, created = raid_ingestion.submit_refresh(force_discovery=True)
 
-            if existing_boss:
-                # Update existing boss
-                for key, value in boss_data.items():
-                    if hasattr(existing_boss, key) and key != 'id':
-                        setattr(existing_boss, key, value)
-                existing_boss.last_updated = datetime.utcnow()
-                raid_boss = existing_boss
-                updated_count += 1
-            else:
-                # Create new boss
-                raid_boss = RaidBoss(**boss_data)
-                db.add(raid_boss)
-                db.flush()  # Get the ID
-                added_count += 1
-
-            # Delete old counters for this boss
-            db.query(RaidCounter).filter_by(raid_boss_id=raid_boss.id).delete()
-
-            # Add new counters
-            for counter_data in counters_data:
-                counter_data['raid_boss_id'] = raid_boss.id
-                counter = RaidCounter(**counter_data)
-                db.add(counter)
-
-        db.commit()
-        db.close()
-
-        print(f"Raid data refresh complete: {added_count} added, {updated_count} updated")
+        if created:
+            print(f"Queued manual raid data refresh {job.id}")
 
         return jsonify({
             'success': True,
-            'data': {
-                'added': added_count,
-                'updated': updated_count,
-                'total_processed': len(raid_data)
-            }
-        })
+            'data': job.to_dict(),
+            'status_url': f'/api/raids/refresh/{job.id}'
+        }), 202
 
     except Exception as e:
-        db.rollback()
-        db.close()
-        print(f"Error refreshing raid data: {e}")
+        print(f"Error queuing raid data refresh: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+@raids_bp.route('/refresh/<string:job_id>', methods=['GET'])
+def get_refresh_status(job_id):
+    """Get the status of a raid data refresh job."""
+    job = raid_ingestion.get_job(job_id)
+
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': f'Refresh job "{job_id}" not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'data': job.to_dict()
+    })
+
+
 @raids_bp.route('/tiers', methods=['GET'])
 def get_raid_tiers():
     """Get list of all raid tiers."""
     try:
         db = get_db()
         tiers = db.query(RaidBoss.tier).distinct().all()
-        db.close()
 
         return jsonify({
             'success': True,
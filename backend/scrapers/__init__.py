@@ -1,15 +1,26 @@
-from .leekduck import LeekDuckScraper
-from .official_blog import OfficialBlogScraper
-from .silph_road import SilphRoadScraper
-from .serebii import SerebiiScraper
-from .pokemongohub import PokemonGoHubScraper
-from .pokebattler import PokebattlerScraper
-
-__all__ = [
-    'LeekDuckScraper',
-    'OfficialBlogScraper',
-    'SilphRoadScraper',
-    'SerebiiScraper',
-    'PokemonGoHubScraper',
-    'PokebattlerScraper'
-]
+"""News and raid scrapers.
+
+Scrapers are imported on first access so that importing one (or the package)
+doesn't load every scraper's dependencies; Selenium in particular is only
+needed for Pokebattler.
+"""
+from importlib import import_module
+
+_SCRAPERS = {
+    'LeekDuckScraper': '.leekduck',
+    'OfficialBlogScraper': '.official_blog',
+    'SilphRoadScraper': '.silph_road',
+    'SerebiiScraper': '.serebii',
+    'PokemonGoHubScraper': '.pokemongohub',
+    'PokebattlerScraper': '.pokebattler'
+}
+
+__all__ = list(_SCRAPERS)
+
+
+def __getattr__(name):
+    if name not in _SCRAPERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_SCRAPERS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,61 @@
+import requests
+from bs4 import BeautifulSoup
+
+from .fetch_memo import fetch_memo
+from .http_cache import http_cache
+
+
+class BaseScraper:
+    """Shared HTTP session and memoized page/feed fetching for news scrapers."""
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': self.USER_AGENT
+        })
+
+    def fetch_soup(self, url):
+        """Fetch and parse an HTML page, reusing it within a scrape cycle.
+
+        Returns None when the server reports the page unchanged (304).
+        """
+        def load():
+            response = self.session.get(url, timeout=10, headers=http_cache.conditional_headers(url))
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            http_cache.record(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return BeautifulSoup(response.content, 'html.parser')
+
+        http_cache.used(url)
+        return fetch_memo.get_or_compute(('soup', url), load)
+
+    def fetch_feed(self, url):
+        """Fetch and parse an RSS feed, reusing it within a scrape cycle.
+
+        Returns None when the server reports the feed unchanged (304).
+        """
+        # Only the RSS scrapers need feedparser, so load it on first use
+        import feedparser
+
+        def load():
+            # Download with the session (and its timeout) rather than letting
+            # feedparser fetch the URL, which can hang on a stalled host
+            response = self.session.get(url, timeout=10, headers=http_cache.conditional_headers(url))
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            http_cache.record(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return feedparser.parse(response.content)
+
+        http_cache.used(url)
+        return fetch_memo.get_or_compute(('feed', url), load)
+
+    def scrape_news(self):
+        """Scrape news items, reusing the result within a scrape cycle."""
+        return fetch_memo.get_or_compute(('news', type(self).__name__), self._scrape_news)
+
+    def _scrape_news(self):
+        raise NotImplementedError
@@ -0,0 +1,176 @@
+"""Long-lived pool of headless Chrome sessions for Selenium scrapers."""
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+class HostThrottle:
+    """Minimum interval between page loads from the same host, shared by all threads.
+
+    Each load reserves the host's next free slot under the lock and then
+    sleeps until it, so pooled browsers working in parallel still reach a
+    site no more than once every min_interval seconds.
+    """
+
+    def __init__(self, min_interval=None):
+        self.min_interval = min_interval if min_interval is not None else float(os.getenv('BROWSER_HOST_MIN_INTERVAL', 2))
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Shared by every pool in the process
+host_throttle = HostThrottle()
+
+
+class PooledBrowser:
+    """A Chrome WebDriver plus the number of pages it has loaded."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_loaded = 0
+
+    def get(self, url):
+        host_throttle.wait(url)
+        self.pages_loaded += 1
+        self.driver.get(url)
+
+
+class BrowserPool:
+    """Size-limited pool of headless browsers reused across scrapes.
+
+    Starting Chrome (and resolving ChromeDriver) costs several seconds, so
+    browsers are created lazily up to max_size and handed back to the pool
+    after each use. A browser is health-checked before it is handed out and
+    recycled after max_pages page loads to keep memory growth in check.
+    """
+
+    def __init__(self, max_size=None, max_pages=None):
+        self.max_size = max_size or int(os.getenv('BROWSER_POOL_SIZE', 3))
+        self.max_pages = max_pages or int(os.getenv('BROWSER_MAX_PAGES', 25))
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._driver_path = None
+
+    def _chrome_options(self):
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')  # Run in background
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        return chrome_options
+
+    def _create(self):
+        """Start a new Chrome WebDriver."""
+        with self._lock:
+            if self._driver_path is None:
+                # Use webdriver-manager to resolve ChromeDriver once per process
+                self._driver_path = ChromeDriverManager().install()
+            driver_path = self._driver_path
+
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=self._chrome_options())
+            print("Chrome WebDriver initialized successfully")
+            return PooledBrowser(driver)
+        except Exception as e:
+            print(f"Error initializing WebDriver: {e}")
+            raise
+
+    def _is_healthy(self, browser):
+        if browser.pages_loaded >= self.max_pages:
+            return False
+        try:
+            return browser.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _destroy(self, browser):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass
+
+    def acquire(self, timeout=None):
+        """Check out a healthy browser, starting one if none is idle."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No browser available in the pool")
+
+        try:
+            while True:
+                try:
+                    browser = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if self._is_healthy(browser):
+                    return browser
+                self._destroy(browser)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, browser, broken=False):
+        """Return a browser to the pool, or discard it if it misbehaved."""
+        try:
+            if broken or browser.pages_loaded >= self.max_pages:
+                self._destroy(browser)
+            else:
+                self._idle.put(browser)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def browser(self, timeout=None):
+        """Context manager that checks a browser out and back in."""
+        browser = self.acquire(timeout=timeout)
+        broken = False
+        try:
+            yield browser
+        except Exception:
+            broken = not self._is_healthy(browser)
+            raise
+        finally:
+            self.release(browser, broken=broken)
+
+    def shutdown(self):
+        """Quit every idle browser."""
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._destroy(browser)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.shutdown)
+        return _pool
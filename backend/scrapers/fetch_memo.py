@@ -0,0 +1,63 @@
+"""Per-cycle memo so each page is fetched and parsed once per scrape cycle."""
+import threading
+from contextlib import contextmanager
+
+
+class FetchMemo:
+    """Thread-safe memo of fetched documents, scoped to a scrape cycle.
+
+    Outside of a cycle every lookup is passed straight through, so scrapers
+    behave exactly as before when used on their own (e.g. from test scripts).
+    Inside a cycle the first caller for a key computes the value while other
+    callers for the same key wait and then reuse it.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._depth = 0
+
+    @contextmanager
+    def cycle(self):
+        """Scope memoization to the enclosed block."""
+        with self._lock:
+            if self._depth == 0:
+                self._entries.clear()
+                self._key_locks.clear()
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._entries.clear()
+                    self._key_locks.clear()
+
+    @property
+    def active(self):
+        return self._depth > 0
+
+    def get_or_compute(self, key, compute):
+        """Return the memoized value for key, computing it on first use.
+
+        Exceptions are not memoized; the next caller will retry.
+        """
+        if not self.active:
+            return compute()
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key in self._entries:
+                return self._entries[key]
+            value = compute()
+            if self.active:
+                self._entries[key] = value
+            return value
+
+
+# Shared by all scrapers
+fetch_memo = FetchMemo()
@@ -0,0 +1,141 @@
+"""On-disk store of HTTP validators (ETag / Last-Modified) for conditional GETs."""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+
+class HTTPCache:
+    """Remember validators per URL so unchanged pages come back as 304.
+
+    Validators are only used inside a scrape cycle. New validators seen during
+    the cycle are held as pending and only written to disk by commit(), which
+    the scheduler calls once the scraped items are safely in the database.
+    Each page remembers which scrape tasks used it, and its validators are
+    only kept if every one of those tasks succeeded: a page whose items
+    failed to parse must be downloaded in full next time, not answered
+    with a 304. Responses that arrive after the cycle has ended are ignored.
+    """
+
+    def __init__(self, path=None):
+        cache_dir = os.getenv('SCRAPER_CACHE_DIR', '.scraper_cache')
+        self.path = path or os.path.join(cache_dir, 'http_validators.json')
+        self._validators = None
+        self._pending = {}
+        self._users = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._depth = 0
+        self._conditional = True
+
+    @contextmanager
+    def cycle(self, conditional=True):
+        """Enable conditional requests for the enclosed scrape cycle.
+
+        With conditional=False nothing is sent as a conditional request,
+        e.g. when the tables the pages feed are empty, but new validators
+        are still staged.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._pending.clear()
+                self._users.clear()
+                self._conditional = conditional
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+
+    @contextmanager
+    def task(self, key):
+        """Attribute the pages fetched in the enclosed block (on this thread) to a scrape task."""
+        previous = getattr(self._local, 'task', None)
+        self._local.task = key
+        try:
+            yield self
+        finally:
+            self._local.task = previous
+
+    @property
+    def active(self):
+        return self._depth > 0
+
+    def _load(self):
+        if self._validators is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._validators = json.load(f)
+            except (OSError, ValueError):
+                self._validators = {}
+        return self._validators
+
+    def validators(self, url):
+        """Return (etag, last_modified) stored for url, if any."""
+        if not self.active or not self._conditional:
+            return None, None
+        with self._lock:
+            entry = self._load().get(url, {})
+        return entry.get('etag'), entry.get('last_modified')
+
+    def conditional_headers(self, url):
+        """Build If-None-Match / If-Modified-Since headers for url."""
+        etag, last_modified = self.validators(url)
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def used(self, url):
+        """Note that the current task read url (fetched or from the memo)."""
+        if not self.active:
+            return
+        with self._lock:
+            self._users.setdefault(url, set()).add(getattr(self._local, 'task', None))
+
+    def record(self, url, etag=None, last_modified=None):
+        """Stage new validators for url until the cycle commits."""
+        if not self.active or not (etag or last_modified):
+            return
+        with self._lock:
+            self._pending[url] = {'etag': etag, 'last_modified': last_modified}
+
+    def commit(self, succeeded):
+        """Persist staged validators of pages whose tasks all succeeded.
+
+        succeeded is the set of task keys (see task()) that produced
+        items; everything else staged in the cycle is dropped.
+        """
+        with self._lock:
+            accepted = {
+                url: entry for url, entry in self._pending.items()
+                if self._users.get(url, {None}) <= succeeded
+            }
+            self._pending.clear()
+            self._users.clear()
+            if not accepted:
+                return
+            validators = self._load()
+            validators.update(accepted)
+
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(validators, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving HTTP cache: {e}")
+
+    def discard(self):
+        """Drop validators staged during the current cycle."""
+        with self._lock:
+            self._pending.clear()
+            self._users.clear()
+
+
+# Shared by all scrapers
+http_cache = HTTPCache()
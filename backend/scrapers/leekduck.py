@@ -1,27 +1,22 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 
+from .base import BaseScraper
 
-class LeekDuckScraper:
+
+class LeekDuckScraper(BaseScraper):
     """Scraper for LeekDuck Pokemon GO event calendar and news."""
 
     BASE_URL = "https://leekduck.com"
     EVENTS_URL = f"{BASE_URL}/events/"
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
     def scrape_events(self):
         """Scrape events from LeekDuck's event calendar."""
         try:
-            response = self.session.get(self.EVENTS_URL, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.fetch_soup(self.EVENTS_URL)
+            if soup is None:
+                print("LeekDuck: events page not modified since last scrape")
+                return []
 
             events = []
             # LeekDuck uses event-item-wrapper class for event listings
@@ -121,13 +116,14 @@ class LeekDuckScraper:
 
         return dates
 
-    def scrape_news(self):
+    def _scrape_news(self):
         """Scrape latest news from LeekDuck."""
         try:
             # News posts are on the main page, not /news/
-            response = self.session.get(self.BASE_URL, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.fetch_soup(self.BASE_URL)
+            if soup is None:
+                print("LeekDuck: news page not modified since last scrape")
+                return []
 
             news_items = []
 
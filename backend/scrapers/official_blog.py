@@ -1,27 +1,24 @@
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import feedparser
 import html
 
+from .base import BaseScraper
 
-class OfficialBlogScraper:
+
+class OfficialBlogScraper(BaseScraper):
     """Scraper for official Pokemon GO blog."""
 
     BASE_URL = "https://pokemongolive.com"
     BLOG_URL = f"{BASE_URL}/en/news/"
     RSS_URL = "https://pokemongolive.com/en/rss"  # If available
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def scrape_news(self):
+    def _scrape_news(self):
         """Scrape news from official Pokemon GO blog."""
         # Try RSS feed first, fall back to HTML scraping
         news_items = self._try_rss_feed()
+        if news_items is None:
+            print("Official Blog: RSS feed not modified since last scrape")
+            return []
         if not news_items:
             news_items = self._scrape_html()
 
@@ -38,9 +35,11 @@ class OfficialBlogScraper:
         return text
 
     def _try_rss_feed(self):
-        """Try to parse RSS feed if available."""
+        """Try to parse RSS feed if available. Returns None if it is unchanged."""
         try:
-            feed = feedparser.parse(self.RSS_URL)
+            feed = self.fetch_feed(self.RSS_URL)
+            if feed is None:
+                return None
             news_items = []
 
             for entry in feed.entries[:15]:  # Limit to 15 most recent
@@ -66,9 +65,10 @@ class OfficialBlogScraper:
     def _scrape_html(self):
         """Scrape news from HTML if RSS is unavailable."""
         try:
-            response = self.session.get(self.BLOG_URL, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.fetch_soup(self.BLOG_URL)
+            if soup is None:
+                print("Official Blog: news page not modified since last scrape")
+                return []
 
             news_items = []
             # Look for article elements
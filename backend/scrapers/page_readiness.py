@@ -0,0 +1,68 @@
+"""Readiness-based waits for Selenium pages instead of fixed sleeps."""
+import os
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+PAGE_TIMEOUT = float(os.getenv('POKEBATTLER_PAGE_TIMEOUT', 15))
+
+# Returns the document state and how many resources have been requested so far
+NETWORK_STATE_SCRIPT = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+
+def _page_not_found(driver):
+    title = (driver.title or '').lower()
+    return '404' in title or 'not found' in title
+
+
+def wait_for_network_idle(driver, timeout=PAGE_TIMEOUT, idle_time=0.5, poll_interval=0.1):
+    """Wait until the document is complete and no new resources load for idle_time.
+
+    Returns True once idle, False if the timeout passes first.
+    """
+    deadline = time.monotonic() + timeout
+    last_count = None
+    stable_since = None
+
+    while time.monotonic() < deadline:
+        try:
+            ready_state, resource_count = driver.execute_script(NETWORK_STATE_SCRIPT)
+        except Exception:
+            return False
+
+        now = time.monotonic()
+        if ready_state == 'complete' and resource_count == last_count:
+            if now - stable_since >= idle_time:
+                return True
+        else:
+            last_count = resource_count
+            stable_since = now
+
+        time.sleep(poll_interval)
+
+    return False
+
+
+def wait_for_page(driver, selectors, timeout=PAGE_TIMEOUT, idle_time=0.5):
+    """Wait for any of the CSS selectors to appear and the network to settle.
+
+    Returns 'ready', 'not_found' (the site served its 404 page) or 'timeout'.
+    """
+    conditions = [EC.presence_of_element_located((By.CSS_SELECTOR, selector)) for selector in selectors]
+    conditions.append(_page_not_found)
+    started = time.monotonic()
+
+    try:
+        WebDriverWait(driver, timeout).until(EC.any_of(*conditions))
+    except TimeoutException:
+        return 'timeout'
+
+    if _page_not_found(driver):
+        return 'not_found'
+
+    remaining = max(timeout - (time.monotonic() - started), idle_time)
+    wait_for_network_idle(driver, timeout=remaining, idle_time=idle_time)
+    return 'ready'
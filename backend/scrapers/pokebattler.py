@@ -1,15 +1,12 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
 import re
 
+from .browser_pool import get_browser_pool
+from .page_readiness import wait_for_page
+from .url_memory import UrlMemory
+
 
 class PokebattlerScraper:
     """Scraper for Pokebattler raid counter data using Selenium."""
@@ -17,52 +14,38 @@ class PokebattlerScraper:
     BASE_URL = "https://www.pokebattler.com"
     RAIDS_URL = f"{BASE_URL}/raids"
 
-    def __init__(self):
-        """Initialize Selenium WebDriver."""
-        self.driver = None
-
-    def _init_driver(self):
-        """Initialize Chrome WebDriver with headless options."""
-        if self.driver:
-            return
+    # Elements that only exist once the dynamic content has rendered
+    RAIDS_PAGE_SELECTORS = ['a[href*="/raids/defenders/"]', 'a[href^="/raids/"]']
+    BOSS_PAGE_SELECTORS = ['table tbody tr', '[class*="counter"]', '[class*="attacker"]']
 
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in background
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    # Common raid bosses to try when the raids page can't be parsed
+    FALLBACK_BOSSES = [
+        {'name': 'Dialga', 'tier': '5', 'is_active': True},
+        {'name': 'Palkia', 'tier': '5', 'is_active': True},
+        {'name': 'Giratina', 'tier': '5', 'is_active': True},
+        {'name': 'Regigigas', 'tier': '5', 'is_active': True},
+    ]
 
-        try:
-            # Use webdriver-manager to automatically handle ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            print("Chrome WebDriver initialized successfully")
-        except Exception as e:
-            print(f"Error initializing WebDriver: {e}")
-            raise
+    # Which boss URL format worked last time, shared by all instances
+    url_memory = UrlMemory('pokebattler')
 
-    def _close_driver(self):
-        """Close the WebDriver."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+    def __init__(self, pool=None):
+        """Use the shared headless browser pool unless one is given."""
+        self.pool = pool or get_browser_pool()
 
     def scrape_raid_bosses(self):
         """Scrape list of current raid bosses from main raids page."""
         try:
-            self._init_driver()
+            with self.pool.browser() as browser:
+                print("Loading Pokebattler raids page...")
+                browser.get(self.RAIDS_URL)
 
-            print("Loading Pokebattler raids page...")
-            self.driver.get(self.RAIDS_URL)
+                # Wait for the boss links to render
+                if wait_for_page(browser.driver, self.RAIDS_PAGE_SELECTORS) != 'ready':
+                    print("Pokebattler raids page did not finish loading, parsing what we have")
 
-            # Wait for content to load (increase wait time for dynamic content)
-            time.sleep(5)
-
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                # Get page source and parse with BeautifulSoup
+                soup = BeautifulSoup(browser.driver.page_source, 'html.parser')
 
             raid_bosses = []
 
@@ -125,66 +108,104 @@ class PokebattlerScraper:
         except Exception as e:
             print(f"Error scraping Pokebattler raid bosses: {e}")
             return []
-        finally:
-            self._close_driver()
 
-    def scrape_boss_counters(self, boss_name):
+    def scrape_boss_counters(self, boss_name, hint_url=None):
         """Scrape counters for a specific raid boss."""
         try:
-            self._init_driver()
+            with self.pool.browser() as browser:
+                return self._scrape_boss_counters(browser, boss_name, hint_url)
 
-            # Convert boss name to URL format
-            boss_slug = boss_name.upper().replace(' ', '_').replace('-', '_')
+        except Exception as e:
+            print(f"Error scraping counters for {boss_name}: {e}")
+            return {
+                'boss': {'name': boss_name},
+                'counters': []
+            }
 
-            # Try multiple URL formats
-            url_formats = [
-                f"{self.BASE_URL}/raids/defenders/{boss_slug}.html",
-                f"{self.BASE_URL}/raids/{boss_slug}",
-                f"{self.BASE_URL}/raids/defenders/{boss_slug}"
-            ]
+    def _candidate_urls(self, boss_name, hint_url=None):
+        """Boss page URLs to try, starting with the one that worked last time."""
+        # Convert boss name to URL format
+        boss_slug = boss_name.upper().replace(' ', '_').replace('-', '_')
+
+        candidates = [
+            self.url_memory.get(boss_name),
+            hint_url,
+            f"{self.BASE_URL}/raids/defenders/{boss_slug}.html",
+            f"{self.BASE_URL}/raids/{boss_slug}",
+            f"{self.BASE_URL}/raids/defenders/{boss_slug}"
+        ]
+
+        urls = []
+        for url in candidates:
+            if url and url not in urls:
+                urls.append(url)
+        return urls
+
+    def _scrape_boss_counters(self, browser, boss_name, hint_url=None):
+        """Scrape counters for a boss using an already checked-out browser."""
+        boss_info = {'name': boss_name}
+        counters = []
 
-            boss_info = {'name': boss_name}
-            counters = []
+        for boss_url in self._candidate_urls(boss_name, hint_url):
+            try:
+                print(f"Trying URL: {boss_url}")
+                browser.get(boss_url)
 
-            for boss_url in url_formats:
-                try:
-                    print(f"Trying URL: {boss_url}")
-                    self.driver.get(boss_url)
-                    time.sleep(4)  # Wait for dynamic content
+                driver = browser.driver
+                readiness = wait_for_page(driver, self.BOSS_PAGE_SELECTORS)
 
-                    # Check if page loaded successfully
-                    if "404" not in self.driver.title.lower() and "not found" not in self.driver.page_source.lower()[:500]:
-                        # Get page source
-                        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                # Check if page loaded successfully
+                if readiness != 'not_found' and "not found" not in driver.page_source.lower()[:500]:
+                    # Get page source
+                    soup = BeautifulSoup(driver.page_source, 'html.parser')
 
-                        # Extract boss info
-                        boss_info = self._extract_boss_info(soup, boss_name)
+                    # Extract boss info
+                    boss_info = self._extract_boss_info(soup, boss_name)
 
-                        # Extract counters from the page
-                        counters = self._extract_counters_from_page(soup)
+                    # Extract counters from the page
+                    counters = self._extract_counters_from_page(soup)
 
-                        if counters:  # If we found counters, stop trying URLs
-                            break
+                    if counters:  # If we found counters, stop trying URLs
+                        self.url_memory.remember(boss_name, boss_url)
+                        break
 
-                except Exception as e:
-                    print(f"Error with URL {boss_url}: {e}")
-                    continue
+            except Exception as e:
+                print(f"Error with URL {boss_url}: {e}")
+                continue
 
-            print(f"Pokebattler: Found {len(counters)} counters for {boss_name}")
+        print(f"Pokebattler: Found {len(counters)} counters for {boss_name}")
 
-            return {
-                'boss': boss_info,
-                'counters': counters
-            }
+        return {
+            'boss': boss_info,
+            'counters': counters
+        }
 
-        except Exception as e:
-            print(f"Error scraping counters for {boss_name}: {e}")
-            return {
-                'boss': {'name': boss_name},
-                'counters': []
-            }
-        finally:
-            self._close_driver()
+    def _scrape_boss_entry(self, boss):
+        """Scrape one boss and merge in its basic info from the raids list."""
+        boss_data = self.scrape_boss_counters(boss['name'], hint_url=boss.get('url'))
+        boss_data['boss'].update(boss)
+
+        return {
+            'boss_data': boss_data['boss'],
+            'counters': boss_data['counters']
+        }
+
+    def scrape_bosses(self, raid_bosses):
+        """Scrape counters for the given bosses in parallel across the browser pool."""
+        all_raid_data = []
+
+        with ThreadPoolExecutor(max_workers=self.pool.max_size, thread_name_prefix='pokebattler') as executor:
+            futures = [executor.submit(self._scrape_boss_entry, boss) for boss in raid_bosses]
+
+            for idx, (boss, future) in enumerate(zip(raid_bosses, futures)):
+                try:
+                    all_raid_data.append(future.result())
+                    print(f"Scraped {boss['name']} ({idx + 1}/{len(raid_bosses)})")
+                except Exception as e:
+                    print(f"Error processing {boss['name']}: {e}")
+                    continue
+
+        return all_raid_data
 
     def scrape_all_raids_and_counters(self):
         """Main method: scrape all raid bosses and their counters."""
@@ -195,39 +216,9 @@ class PokebattlerScraper:
 
         if not raid_bosses:
             print("No raid bosses found. Using fallback approach...")
-            # Fallback: try common raid bosses
-            raid_bosses = [
-                {'name': 'Dialga', 'tier': '5', 'is_active': True},
-                {'name': 'Palkia', 'tier': '5', 'is_active': True},
-                {'name': 'Giratina', 'tier': '5', 'is_active': True},
-                {'name': 'Regigigas', 'tier': '5', 'is_active': True},
-            ]
-
-        all_raid_data = []
-
-        # Limit to 10 bosses to avoid long scraping times
-        for idx, boss in enumerate(raid_bosses[:10]):
-            try:
-                print(f"Scraping {boss['name']} ({idx + 1}/{min(len(raid_bosses), 10)})...")
+            raid_bosses = [dict(boss) for boss in self.FALLBACK_BOSSES]
 
-                # Get detailed counters for this boss
-                boss_data = self.scrape_boss_counters(boss['name'])
-
-                # Merge with basic boss info
-                boss_data['boss'].update(boss)
-
-                all_raid_data.append({
-                    'boss_data': boss_data['boss'],
-                    'counters': boss_data['counters']
-                })
-
-                # Rate limiting
-                if idx < min(len(raid_bosses), 10) - 1:
-                    time.sleep(2)
-
-            except Exception as e:
-                print(f"Error processing {boss['name']}: {e}")
-                continue
+        all_raid_data = self.scrape_bosses(raid_bosses)
 
         print(f"Pokebattler scraping complete: {len(all_raid_data)} raids processed")
         return all_raid_data
@@ -1,27 +1,24 @@
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import feedparser
 import html
 
+from .base import BaseScraper
 
-class PokemonGoHubScraper:
+
+class PokemonGoHubScraper(BaseScraper):
     """Scraper for Pokemon GO Hub news."""
 
     BASE_URL = "https://pokemongohub.net"
     NEWS_URL = f"{BASE_URL}/post/news/"
     RSS_URL = f"{BASE_URL}/feed/"
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def scrape_news(self):
+    def _scrape_news(self):
         """Scrape news from Pokemon GO Hub."""
         # Try RSS feed first
         news_items = self._try_rss_feed()
+        if news_items is None:
+            print("Pokemon GO Hub: RSS feed not modified since last scrape")
+            return []
         if not news_items:
             news_items = self._scrape_html()
 
@@ -40,9 +37,11 @@ class PokemonGoHubScraper:
         return text
 
     def _try_rss_feed(self):
-        """Try to parse RSS feed."""
+        """Try to parse RSS feed. Returns None if it is unchanged."""
         try:
-            feed = feedparser.parse(self.RSS_URL)
+            feed = self.fetch_feed(self.RSS_URL)
+            if feed is None:
+                return None
             news_items = []
 
             for entry in feed.entries[:15]:
@@ -69,9 +68,10 @@ class PokemonGoHubScraper:
     def _scrape_html(self):
         """Scrape news from HTML."""
         try:
-            response = self.session.get(self.NEWS_URL, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.fetch_soup(self.NEWS_URL)
+            if soup is None:
+                print("Pokemon GO Hub: news page not modified since last scrape")
+                return []
 
             news_items = []
 
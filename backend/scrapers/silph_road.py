@@ -1,26 +1,21 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 
+from .base import BaseScraper
 
-class SilphRoadScraper:
+
+class SilphRoadScraper(BaseScraper):
     """Scraper for The Silph Road news and research."""
 
     BASE_URL = "https://thesilphroad.com"
     NEWS_URL = f"{BASE_URL}/news"
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def scrape_news(self):
+    def _scrape_news(self):
         """Scrape news from The Silph Road."""
         try:
-            response = self.session.get(self.NEWS_URL, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.fetch_soup(self.NEWS_URL)
+            if soup is None:
+                print("Silph Road: news page not modified since last scrape")
+                return []
 
             news_items = []
             # The Silph Road uses different HTML structure - adjust as needed
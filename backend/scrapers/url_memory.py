@@ -0,0 +1,48 @@
+"""Persistent memory of which URL worked for each scraped item."""
+import json
+import os
+import threading
+
+
+class UrlMemory:
+    """Small JSON-backed map of key -> last URL that worked.
+
+    Lets a scraper go straight to the right URL format on later runs instead
+    of trying every candidate in turn.
+    """
+
+    def __init__(self, name, path=None):
+        cache_dir = os.getenv('SCRAPER_CACHE_DIR', '.scraper_cache')
+        self.path = path or os.path.join(cache_dir, f'{name}_urls.json')
+        self._urls = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._urls is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._urls = json.load(f)
+            except (OSError, ValueError):
+                self._urls = {}
+        return self._urls
+
+    def get(self, key):
+        with self._lock:
+            return self._load().get(key)
+
+    def remember(self, key, url):
+        """Record the URL that worked for key, saving only when it changed."""
+        with self._lock:
+            urls = self._load()
+            if urls.get(key) == url:
+                return
+            urls[key] = url
+
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(urls, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error saving URL memory: {e}")
@@ -1,5 +1,22 @@
-from .summarizer import AISummarizer
-from .scheduler import setup_scheduler
-from .pokemon_assistant import PokemonAssistant
+"""Application services.
 
-__all__ = ['AISummarizer', 'setup_scheduler', 'PokemonAssistant']
+Exports are imported on first access so that using one service doesn't load
+the others' dependencies (e.g. APScheduler or the Anthropic SDK).
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    'AISummarizer': '.summarizer',
+    'setup_scheduler': '.scheduler',
+    'PokemonAssistant': '.pokemon_assistant'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,261 @@
+"""In-process autocomplete index over raid boss names."""
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and turn punctuation into single spaces ("Ho-Oh" -> "ho oh")."""
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name.lower()).split())
+
+
+# Form modifiers (and their other spellings) that can come before or after the species name
+MODIFIERS = {
+    'shadow': 'shadow', 'mega': 'mega', 'primal': 'primal',
+    'alolan': 'alolan', 'alola': 'alolan',
+    'galarian': 'galarian', 'galar': 'galarian',
+    'hisuian': 'hisuian', 'hisui': 'hisuian',
+    'paldean': 'paldean', 'paldea': 'paldean'
+}
+MODIFIER_ORDER = ['shadow', 'mega', 'primal', 'alolan', 'galarian', 'hisuian', 'paldean']
+
+# Words that don't tell bosses apart ("Giratina (Origin Forme)")
+FILLER_WORDS = {'form', 'forme', 'raid', 'boss'}
+
+
+def _name_words(name):
+    return [MODIFIERS.get(word, word) for word in normalize_name(name).split() if word not in FILLER_WORDS]
+
+
+def name_keys(name):
+    """Spelling-independent keys for a boss name: (ordered, unordered).
+
+    Both drop filler words, unify modifier spellings and ignore case,
+    accents, spaces and hyphens. The ordered key moves modifiers to the
+    front ("Groudon Primal" -> "primalgroudon"); the unordered key also
+    ignores word order ("Kyurem Black" and "Black Kyurem").
+    """
+    words = _name_words(name)
+    modifiers = [word for word in MODIFIER_ORDER if word in words]
+    rest = [word for word in words if word not in MODIFIER_ORDER]
+    return ''.join(modifiers + rest), ' '.join(sorted(modifiers + rest))
+
+
+def species_key(name):
+    """The name's key without form modifiers ("Shadow Latias" -> "latias")."""
+    return ''.join(word for word in _name_words(name) if word not in MODIFIER_ORDER)
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent swaps count as one edit), or limit + 1 if above limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def typo_allowance(key):
+    """Edits a lookup key may be away from a boss name: none for short names, more for long ones."""
+    if len(key) < 4:
+        return 0
+    return 1 if len(key) < 8 else 2
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Match quality, best first
+FULL_PREFIX, WORD_PREFIX, INFIX = 0, 1, 2
+
+
+class BossNameIndex:
+    """Boss names held in memory for autocomplete, so keystrokes don't hit the database.
+
+    Lookups walk a sorted array of search keys with bisect: the full
+    normalized name, the name from each later word on ("groudon" for
+    "Primal Groudon") and the name with spaces removed ("hooh"). Queries
+    that match none of those prefixes fall back to a trigram index over
+    the names, which finds matches in the middle of a word. Results are
+    ranked active bosses first, then by how well they matched.
+
+    resolve() maps a requested name to one boss for the counters
+    endpoint, tolerating other spellings and small typos.
+
+    The index is rebuilt after each raid refresh, and reloaded from the
+    database when it is older than ttl seconds, which picks up changes
+    made by other processes.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('BOSS_INDEX_TTL', 300))
+        self._lock = threading.Lock()
+        self._state = None
+        self._built_at = 0.0
+
+    def rebuild(self, bosses, known_names=()):
+        """Replace the index with the given RaidBoss rows.
+
+        known_names are other Pokemon names (counters, queued bosses);
+        resolve() won't take one of those for a typo of a boss.
+        """
+        entries = []
+        keys = []
+        grams = {}
+        ordered_keys = {}
+        unordered_keys = {}
+
+        for boss in bosses:
+            normalized = normalize_name(boss.name)
+            if not normalized:
+                continue
+
+            position = len(entries)
+            ordered, unordered = name_keys(boss.name)
+            entries.append(({
+                'id': boss.id,
+                'name': boss.name,
+                'tier': boss.tier,
+                'is_active': boss.is_active,
+                'types': boss.types.split(',') if boss.types else []
+            }, normalized, ordered))
+
+            words = normalized.split()
+            keys.append((normalized, FULL_PREFIX, position))
+            keys.append((normalized.replace(' ', ''), FULL_PREFIX, position))
+            for i in range(1, len(words)):
+                keys.append((' '.join(words[i:]), WORD_PREFIX, position))
+
+            for gram in _trigrams(normalized.replace(' ', '')) | _trigrams(ordered):
+                grams.setdefault(gram, set()).add(position)
+
+            ordered_keys.setdefault(ordered, position)
+            unordered_keys.setdefault(unordered, position)
+
+        species = {species_key(name) for name in known_names}
+        species.update(species_key(entry[0]['name']) for entry in entries)
+        species.discard('')
+
+        keys.sort()
+        # Swap in one assignment so concurrent searches see the old or new index, never a mix
+        self._state = (entries, keys, [key for key, _, _ in keys], grams, ordered_keys, unordered_keys, species)
+        self._built_at = time.monotonic()
+
+    @staticmethod
+    def _query(db):
+        from models.database import RaidBoss, RaidCounter, RaidRefreshEntry
+
+        known_names = [name for name, in db.query(RaidCounter.pokemon_name).distinct()]
+        known_names += [name for name, in db.query(RaidRefreshEntry.boss_name)]
+        return db.query(RaidBoss).all(), known_names
+
+    def load(self, db):
+        """Rebuild from the database."""
+        with self._lock:
+            self.rebuild(*self._query(db))
+
+    def _stale(self):
+        return self._state is None or time.monotonic() - self._built_at > self.ttl
+
+    def ensure_loaded(self, db):
+        """Load the index on first use and whenever it has gone stale."""
+        if self._stale():
+            with self._lock:
+                # Another request may have reloaded it while we waited
+                if self._stale():
+                    self.rebuild(*self._query(db))
+
+    def search(self, query, limit=10):
+        """Bosses whose name matches query, as autocomplete dicts."""
+        state = self._state
+        query = normalize_name(query)
+        if state is None or not query:
+            return []
+        entries, keys, key_strings, grams, _, _, _ = state
+
+        # Best match quality per boss
+        matches = {}
+        for prefix in {query, query.replace(' ', '')}:
+            i = bisect_left(key_strings, prefix)
+            while i < len(keys) and key_strings[i].startswith(prefix):
+                _, quality, position = keys[i]
+                matches[position] = min(quality, matches.get(position, INFIX))
+                i += 1
+
+        # Matches inside a word, for queries long enough to have trigrams
+        compact = query.replace(' ', '')
+        if len(matches) < limit and len(compact) >= 3:
+            candidates = set.intersection(*(grams.get(gram, set()) for gram in _trigrams(compact)))
+            for position in candidates:
+                if position not in matches and compact in entries[position][1].replace(' ', ''):
+                    matches[position] = INFIX
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (not entries[item[0]][0]['is_active'], item[1], entries[item[0]][1])
+        )
+        return [entries[position][0] for position, _ in ranked[:limit]]
+
+    def resolve(self, name):
+        """The boss a requested name most likely means, as (boss dict, match) or None.
+
+        match is 'normalized' when the name differs only in spelling
+        ("giratina-origin", "Groudon Primal") and 'fuzzy' when it is
+        within a few typos of a boss ("Girtina"). A fuzzy match needs one
+        boss to be closer than all others, and is refused when the name is
+        itself a known Pokemon ("Latias" is not a typo of "Latios").
+        """
+        state = self._state
+        if state is None:
+            return None
+        entries, _, _, grams, ordered_keys, unordered_keys, species = state
+
+        ordered, unordered = name_keys(name)
+        if not ordered:
+            return None
+
+        for key, lookup in ((ordered, ordered_keys), (unordered, unordered_keys)):
+            if key in lookup:
+                return entries[lookup[key]][0], 'normalized'
+
+        limit = typo_allowance(ordered)
+        if not limit or species_key(name) in species:
+            return None
+
+        # A name within a few typos still shares most of its trigrams
+        candidates = set()
+        for gram in _trigrams(ordered):
+            candidates.update(grams.get(gram, ()))
+
+        best_distance = limit + 1
+        closest = []
+        for position in candidates:
+            boss, _, boss_key = entries[position]
+            distance = edit_distance(ordered, boss_key, limit)
+            if distance < best_distance:
+                best_distance, closest = distance, [boss]
+            elif distance == best_distance:
+                closest.append(boss)
+
+        if best_distance > limit or len(closest) != 1:
+            return None
+        return closest[0], 'fuzzy'
+
+
+# Shared by the raids routes and raid ingestion in this process
+boss_index = BossNameIndex()
@@ -0,0 +1,157 @@
+"""Precomputed calendar months, stored as ready-to-send JSON."""
+import json
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from models.database import Event, CalendarMonth, session_scope
+
+
+def month_bounds(year, month):
+    """First and last instant of a month."""
+    start_of_month = datetime(year, month, 1)
+    if month == 12:
+        end_of_month = datetime(year + 1, 1, 1) - timedelta(seconds=1)
+    else:
+        end_of_month = datetime(year, month + 1, 1) - timedelta(seconds=1)
+    return start_of_month, end_of_month
+
+
+def build_calendar_query(db, year, month):
+    """Events that start in the month or run into it from an earlier one (unordered).
+
+    The two cases are separate OR branches so each is a range search on
+    its own index (idx_event_start and idx_event_end). An ORDER BY would
+    make the database walk one whole index instead, so callers sort.
+    """
+    start_of_month, end_of_month = month_bounds(year, month)
+
+    return db.query(Event).filter(or_(
+        and_(Event.start_date >= start_of_month, Event.start_date <= end_of_month),
+        and_(Event.end_date >= start_of_month, Event.start_date < start_of_month)
+    ))
+
+
+def _add_months(year, month, count):
+    year, month = divmod(year * 12 + month - 1 + count, 12)
+    return year, month + 1
+
+
+def snapshot_window(today=None):
+    """First and last (year, month) whose calendars are stored as snapshots.
+
+    Only months within CALENDAR_SNAPSHOT_MONTHS of the current one are
+    stored; requests for other months are computed each time, so a client
+    walking through the years can't fill the table.
+    """
+    today = today or datetime.utcnow()
+    months = int(os.getenv('CALENDAR_SNAPSHOT_MONTHS', 12))
+    return _add_months(today.year, today.month, -months), _add_months(today.year, today.month, months)
+
+
+def months_spanned(start_date, end_date, window):
+    """(year, month) pairs in window that an event appears in, from its start month to its end month.
+
+    Matches build_calendar_query, which shows an event in every month it
+    runs through; window keeps an event with a bad end date from fanning
+    out beyond the stored months.
+    """
+    if start_date is None:
+        return []
+
+    last = end_date if end_date and end_date > start_date else start_date
+    first_stored, last_stored = window
+
+    months = []
+    year, month = max((start_date.year, start_date.month), first_stored)
+    while (year, month) <= min((last.year, last.month), last_stored):
+        months.append((year, month))
+        year, month = _add_months(year, month, 1)
+    return months
+
+
+def calendar_entry(event):
+    """An event as the calendar view shows it."""
+    return {
+        'id': event.id,
+        'title': event.title,
+        'start': event.start_date.isoformat() if event.start_date else None,
+        'end': event.end_date.isoformat() if event.end_date else None,
+        'type': event.event_type,
+        'summary': event.summary,
+        'url': event.url,
+        'source': event.source
+    }
+
+
+def month_json(db, year, month):
+    """Query and serialize one month. Returns (JSON, event count)."""
+    events = sorted(build_calendar_query(db, year, month).all(), key=lambda e: (e.start_date or datetime.min, e.id))
+    return json.dumps([calendar_entry(event) for event in events], separators=(',', ':')), len(events)
+
+
+def build_month(db, year, month):
+    """Query and serialize one month, saving the snapshot in db's transaction. Returns the JSON."""
+    payload, event_count = month_json(db, year, month)
+    db.merge(CalendarMonth(
+        year=year, month=month, payload=payload,
+        event_count=event_count, built_date=datetime.utcnow()
+    ))
+    return payload
+
+
+def refresh_months(db, months):
+    """Rebuild the snapshots for the given (year, month) pairs, e.g. after events changed.
+
+    Months outside the snapshot window are skipped, and snapshots that
+    have fallen out of it are deleted.
+    """
+    first_stored, last_stored = snapshot_window()
+    for year, month in sorted(set(months)):
+        if first_stored <= (year, month) <= last_stored:
+            build_month(db, year, month)
+
+    db.query(CalendarMonth).filter(or_(
+        CalendarMonth.year < first_stored[0],
+        and_(CalendarMonth.year == first_stored[0], CalendarMonth.month < first_stored[1]),
+        CalendarMonth.year > last_stored[0],
+        and_(CalendarMonth.year == last_stored[0], CalendarMonth.month > last_stored[1])
+    )).delete(synchronize_session=False)
+
+
+def months_for_events(events):
+    """Every stored month touched by a list of event dicts or rows."""
+    window = snapshot_window()
+    months = set()
+    for event in events:
+        if isinstance(event, dict):
+            start_date, end_date = event.get('start_date'), event.get('end_date')
+        else:
+            start_date, end_date = event.start_date, event.end_date
+        months.update(months_spanned(start_date, end_date, window))
+    return months
+
+
+def get_month_json(db, year, month):
+    """The month's calendar entries as a JSON array.
+
+    Months in the snapshot window are built on first request and stored;
+    others are computed for each request.
+    """
+    first_stored, last_stored = snapshot_window()
+    if not first_stored <= (year, month) <= last_stored:
+        return month_json(db, year, month)[0]
+
+    snapshot = db.get(CalendarMonth, (year, month))
+    if snapshot:
+        return snapshot.payload
+
+    try:
+        with session_scope() as session:
+            return build_month(session, year, month)
+    except IntegrityError:
+        # Another request built it at the same time
+        db.expire_all()
+        return db.get(CalendarMonth, (year, month)).payload
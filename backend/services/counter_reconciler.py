@@ -0,0 +1,93 @@
+"""Diff-based reconciliation of scraped raid counters against stored rows."""
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select, update
+
+from models.database import RaidCounter
+
+# A counter is the same row if these match...
+KEY_FIELDS = ('pokemon_name', 'fast_move', 'charge_move', 'is_shadow', 'is_mega')
+# ...and only needs an UPDATE if one of these changed
+VALUE_FIELDS = ('rank', 'pokemon_types', 'dps', 'tdo', 'ttw', 'is_legendary')
+
+BOOLEAN_FIELDS = {'is_shadow', 'is_mega', 'is_legendary'}
+
+
+def _normalize(field, value):
+    if field in BOOLEAN_FIELDS:
+        return bool(value)
+    return value
+
+
+def _counter_key(counter):
+    return tuple(_normalize(field, counter.get(field)) for field in KEY_FIELDS)
+
+
+def _counter_values(counter):
+    return {field: _normalize(field, counter.get(field)) for field in VALUE_FIELDS}
+
+
+def reconcile_counters(db, raid_boss_id, scraped_counters):
+    """Bring a boss's stored counters in line with a fresh scrape.
+
+    Rows are matched on (pokemon_name, fast_move, charge_move, shadow, mega).
+    Matching rows are updated only if their rank or stats changed, new
+    counters are bulk inserted and counters that disappeared are deleted.
+    Returns a dict of inserted/updated/deleted/unchanged counts.
+
+    An empty scrape changes nothing: it means the scrape failed, and
+    treating it as "every counter disappeared" would wipe the boss.
+    """
+    if not scraped_counters:
+        return {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+    columns = [RaidCounter.id] + [getattr(RaidCounter, field) for field in KEY_FIELDS + VALUE_FIELDS]
+    stored = {}
+    duplicate_ids = []
+    for row in db.execute(select(*columns).where(RaidCounter.raid_boss_id == raid_boss_id)).mappings():
+        key = _counter_key(row)
+        if key in stored:
+            duplicate_ids.append(row['id'])
+        else:
+            stored[key] = row
+
+    now = datetime.utcnow()
+    inserts = []
+    updates = []
+    seen = set()
+    unchanged = 0
+
+    for counter in scraped_counters:
+        key = _counter_key(counter)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        values = _counter_values(counter)
+        row = stored.get(key)
+        if row is None:
+            new_row = dict(zip(KEY_FIELDS, key))
+            new_row.update(values)
+            new_row.update(raid_boss_id=raid_boss_id, scraped_date=now)
+            inserts.append(new_row)
+        elif any(row[field] != value for field, value in values.items()):
+            updates.append(dict(values, id=row['id'], scraped_date=now))
+        else:
+            unchanged += 1
+
+    delete_ids = duplicate_ids + [row['id'] for key, row in stored.items() if key not in seen]
+
+    if delete_ids:
+        db.execute(delete(RaidCounter).where(RaidCounter.id.in_(delete_ids)))
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany
+        db.execute(update(RaidCounter), updates)
+    if inserts:
+        db.execute(insert(RaidCounter), inserts)
+
+    return {
+        'inserted': len(inserts),
+        'updated': len(updates),
+        'deleted': len(delete_ids),
+        'unchanged': unchanged
+    }
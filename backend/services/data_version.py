@@ -0,0 +1,94 @@
+"""Version counters for the data behind the read endpoints.
+
+Jobs that change news, events or raid data bump the matching counter in
+the same transaction as the change. Readers compare counters instead of
+the data itself: a response cached at version N is still valid while the
+counter is N.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+NEWS, EVENTS, RAIDS = 'news', 'events', 'raids'
+
+
+def bump_data_version(db, *names):
+    """Increment the named counters as part of db's current transaction.
+
+    Takes effect when the caller commits; this process sees the new
+    versions straight after the commit, other processes within
+    DATA_VERSION_TTL seconds.
+
+    A missing counter row is created with an INSERT that skips conflicts,
+    then incremented like any other: two processes creating the same row
+    at once must not fail (and roll back) the caller's transaction.
+    """
+    from models.database import DataVersion
+    from services.persistence import insert_skipping_conflicts
+
+    now = datetime.utcnow()
+    for name in names:
+        db.execute(insert_skipping_conflicts(db, DataVersion).values(name=name, version=0, updated_date=now))
+        db.execute(
+            update(DataVersion)
+            .where(DataVersion.name == name)
+            .values(version=DataVersion.version + 1, updated_date=now)
+        )
+    db.info['data_version_bumped'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _expire_after_bump(session):
+    if session.info.pop('data_version_bumped', False):
+        data_versions.expire()
+
+
+class DataVersions:
+    """In-memory copy of the version counters, reread at most every ttl seconds.
+
+    Reading versions on every request would cost a query per request, which
+    is what the response cache exists to avoid.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('DATA_VERSION_TTL', 5))
+        self._lock = threading.Lock()
+        self._versions = None
+        self._read_at = 0.0
+        self._listeners = []
+
+    def subscribe(self, callback):
+        """Call callback() whenever a counter is seen to change."""
+        self._listeners.append(callback)
+
+    def expire(self):
+        self._read_at = 0.0
+
+    def _refresh(self):
+        from models.database import DataVersion, session_scope
+
+        with session_scope() as session:
+            versions = dict(session.query(DataVersion.name, DataVersion.version).all())
+
+        changed = self._versions is not None and versions != self._versions
+        self._versions = versions
+        self._read_at = time.monotonic()
+        if changed:
+            for callback in self._listeners:
+                callback()
+
+    def current(self, names):
+        """Tuple of the named counters' versions (0 for a counter never bumped)."""
+        if self._versions is None or time.monotonic() - self._read_at > self.ttl:
+            with self._lock:
+                if self._versions is None or time.monotonic() - self._read_at > self.ttl:
+                    self._refresh()
+        versions = self._versions
+        return tuple(versions.get(name, 0) for name in names)
+
+
+data_versions = DataVersions()
@@ -1,10 +1,7 @@
 """Smart Event Recommender using Claude AI."""
 import os
-from anthropic import Anthropic
 from datetime import datetime
-from models.database import Event
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from models.database import Event, session_scope
 
 
 class EventRecommender:
@@ -16,6 +13,7 @@ class EventRecommender:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
 
+        from anthropic import Anthropic
         self.client = Anthropic(api_key=api_key)
         self.model = "claude-3-haiku-20240307"  # Using Haiku - fast and efficient
 
@@ -40,31 +38,25 @@ Be encouraging, practical, and specific. Tailor advice to their stated preferenc
     def get_upcoming_events(self):
         """Fetch upcoming and active events from the database."""
         try:
-            # Create database session
-            db_path = os.getenv('DATABASE_URL', 'sqlite:///pokemon_go.db')
-            engine = create_engine(db_path)
-            Session = sessionmaker(bind=engine)
-            session = Session()
-
-            # Get events that haven't ended yet
-            now = datetime.now()
-            events = session.query(Event).filter(
-                Event.end_date >= now
-            ).order_by(Event.start_date).all()
-
-            session.close()
-
-            # Convert to dictionaries
-            event_list = []
-            for event in events:
-                event_list.append({
-                    'name': event.name,
-                    'type': event.event_type,
-                    'start_date': event.start_date.strftime('%Y-%m-%d %H:%M') if event.start_date else 'TBD',
-                    'end_date': event.end_date.strftime('%Y-%m-%d %H:%M') if event.end_date else 'TBD',
-                    'description': event.description or 'No description available',
-                    'source': event.source
-                })
+            # Use the app's pooled engine rather than a new one per call
+            with session_scope() as session:
+                # Get events that haven't ended yet
+                now = datetime.now()
+                events = session.query(Event).filter(
+                    Event.end_date >= now
+                ).order_by(Event.start_date).all()
+
+                # Convert to dictionaries
+                event_list = []
+                for event in events:
+                    event_list.append({
+                        'name': event.title,
+                        'type': event.event_type,
+                        'start_date': event.start_date.strftime('%Y-%m-%d %H:%M') if event.start_date else 'TBD',
+                        'end_date': event.end_date.strftime('%Y-%m-%d %H:%M') if event.end_date else 'TBD',
+                        'description': event.description or 'No description available',
+                        'source': event.source
+                    })
 
             return event_list
 
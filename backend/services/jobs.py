@@ -0,0 +1,376 @@
+"""Background job runner with de-duplication of in-flight work."""
+import json
+import os
+import queue
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+
+class BaseJob:
+    """Status fields shared by jobs run here and jobs read from the job store."""
+
+    @property
+    def is_active(self):
+        return self.status in ('queued', 'running')
+
+    def progress_snapshot(self):
+        return self.progress
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress_snapshot(),
+            'result': self.result,
+            'error': self.error,
+            'created_date': self.created_date.isoformat() if self.created_date else None,
+            'started_date': self.started_date.isoformat() if self.started_date else None,
+            'finished_date': self.finished_date.isoformat() if self.finished_date else None
+        }
+
+
+class Job(BaseJob):
+    """A unit of background work and its status."""
+
+    def __init__(self, kind, func, params=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.func = func
+        self.params = params or {}
+        self.status = 'queued'
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_date = datetime.utcnow()
+        self.started_date = None
+        self.finished_date = None
+        self._done = threading.Event()
+        self._progress_lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes. Returns False if the timeout passed first."""
+        return self._done.wait(timeout)
+
+    def update_progress(self, *path, **values):
+        """Set progress values, in the nested dict named by path if given.
+
+        job.update_progress('sources', 'LeekDuck', events={...}) sets
+        progress['sources']['LeekDuck']['events']. Progress is read by the
+        heartbeat and status requests on other threads, so it is only
+        changed through here.
+        """
+        with self._progress_lock:
+            target = self.progress
+            for key in path:
+                target = target.setdefault(key, {})
+            target.update(values)
+
+    def progress_json(self):
+        """Progress serialized under the progress lock."""
+        with self._progress_lock:
+            return _dump(self.progress)
+
+    def progress_snapshot(self):
+        return json.loads(self.progress_json())
+
+
+def _dump(value):
+    return json.dumps(value, default=str) if value is not None else None
+
+
+def _load(value):
+    return json.loads(value) if value else None
+
+
+class StoredJob(BaseJob):
+    """A job as recorded in the job store, possibly run by another process."""
+
+    def __init__(self, row, store):
+        self._store = store
+        self._read(row)
+
+    def _read(self, row):
+        self.id = row.id
+        self.kind = row.kind
+        self.status = row.status
+        self.params = _load(row.params) or {}
+        self.progress = _load(row.progress) or {}
+        self.result = _load(row.result)
+        self.error = row.error
+        self.created_date = row.created_date
+        self.started_date = row.started_date
+        self.finished_date = row.finished_date
+
+    def wait(self, timeout=None):
+        """Poll the store until the job finishes. Returns False if the timeout passed first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_active:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self._store.poll_interval)
+            latest = self._store.load(self.id)
+            if latest is None:
+                return True
+            self.__dict__.update(vars(latest))
+        return True
+
+
+class JobStore:
+    """Jobs recorded in the background_jobs table, shared by every worker process.
+
+    A unique active_kind column lets only one job of each kind be queued
+    or running across all processes, and any process can look a job up by
+    ID. The process running a job saves its status and progress every
+    heartbeat seconds; a job not heard from for stale_after seconds is
+    taken to have died with its process and marked failed.
+    """
+
+    def __init__(self, heartbeat=None, stale_after=None, poll_interval=None, history_days=None,
+                 session_factory=None):
+        self.heartbeat = heartbeat or float(os.getenv('JOB_HEARTBEAT_INTERVAL', 15))
+        self.stale_after = stale_after or float(os.getenv('JOB_STALE_SECONDS', 120))
+        self.poll_interval = poll_interval or float(os.getenv('JOB_POLL_INTERVAL', 2))
+        self.history_days = history_days or int(os.getenv('JOB_HISTORY_DAYS', 7))
+        self.holder_id = f'{socket.gethostname()}:{os.getpid()}'
+        self._session_factory = session_factory
+
+    def _session(self):
+        if self._session_factory is None:
+            from models.database import SessionLocal
+            return SessionLocal()
+        return self._session_factory()
+
+    def _is_stale(self, row, now):
+        last_seen = row.heartbeat_date or row.created_date
+        return last_seen is None or now - last_seen > timedelta(seconds=self.stale_after)
+
+    def _abandon(self, session, row, now):
+        from models.database import BackgroundJob
+
+        session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == row.id, BackgroundJob.finished_date.is_(None))
+            .values(status='failed', error='Abandoned: its worker stopped responding',
+                    active_kind=None, finished_date=now)
+        )
+        session.commit()
+        print(f"Marked {row.kind} job {row.id} from {row.holder} as abandoned")
+
+    def claim(self, job):
+        """Record job as the active job of its kind.
+
+        Returns None once recorded, or the StoredJob of that kind already
+        queued or running somewhere else.
+        """
+        from models.database import BackgroundJob
+
+        for _ in range(3):
+            now = datetime.utcnow()
+            session = self._session()
+            try:
+                session.add(BackgroundJob(
+                    id=job.id, kind=job.kind, active_kind=job.kind, status=job.status,
+                    params=_dump(job.params), progress=job.progress_json(), holder=self.holder_id,
+                    created_date=job.created_date, heartbeat_date=now
+                ))
+                session.commit()
+                self._prune(session, now)
+                return None
+            except IntegrityError:
+                session.rollback()
+                row = session.query(BackgroundJob).filter_by(active_kind=job.kind).first()
+                if row is None:
+                    # It finished in the meantime
+                    continue
+                if not self._is_stale(row, now):
+                    return StoredJob(row, self)
+                self._abandon(session, row, now)
+            finally:
+                session.close()
+
+        raise RuntimeError(f'Could not record {job.kind} job: another one keeps starting')
+
+    def save(self, job):
+        """Write a job's status and progress, and note that its process is alive."""
+        from models.database import BackgroundJob
+
+        session = self._session()
+        try:
+            session.execute(
+                update(BackgroundJob)
+                # A job marked abandoned stays abandoned
+                .where(BackgroundJob.id == job.id, BackgroundJob.finished_date.is_(None))
+                .values(
+                    status=job.status,
+                    active_kind=job.kind if job.is_active else None,
+                    progress=job.progress_json(),
+                    result=_dump(job.result),
+                    error=job.error,
+                    started_date=job.started_date,
+                    finished_date=job.finished_date,
+                    heartbeat_date=datetime.utcnow()
+                )
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"Error saving {job.kind} job {job.id}: {e}")
+        finally:
+            session.close()
+
+    def load(self, job_id):
+        """The stored job with this ID, or None if unknown."""
+        from models.database import BackgroundJob
+
+        session = self._session()
+        try:
+            row = session.get(BackgroundJob, job_id)
+            if row is None:
+                return None
+            now = datetime.utcnow()
+            if row.finished_date is None and self._is_stale(row, now):
+                self._abandon(session, row, now)
+                session.refresh(row)
+            return StoredJob(row, self)
+        finally:
+            session.close()
+
+    def active(self, kind):
+        """The queued or running job of this kind in any process, if any."""
+        from models.database import BackgroundJob
+
+        session = self._session()
+        try:
+            job_id = session.query(BackgroundJob.id).filter_by(active_kind=kind).scalar()
+        finally:
+            session.close()
+        job = self.load(job_id) if job_id else None
+        return job if job and job.is_active else None
+
+    def _prune(self, session, now):
+        from models.database import BackgroundJob
+
+        session.execute(
+            delete(BackgroundJob)
+            .where(BackgroundJob.finished_date < now - timedelta(days=self.history_days))
+        )
+        session.commit()
+
+
+class JobRunner:
+    """Run jobs one at a time on a background worker thread.
+
+    Submitting a job of a kind that is already queued or running returns the
+    existing job instead of starting another, so repeated requests collapse
+    into a single piece of work. Finished jobs are kept (up to max_history)
+    so their status can still be looked up.
+
+    With a store, jobs are also recorded in the database: the
+    de-duplication then holds across worker processes, and get() finds
+    jobs submitted to any of them.
+    """
+
+    def __init__(self, name, max_history=50, store=None):
+        self.name = name
+        self.max_history = max_history
+        self.store = store
+        self._jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._heartbeat = None
+
+    def submit(self, kind, func, **params):
+        """Queue func(job, **params) unless a job of this kind is in flight.
+
+        Returns (job, created).
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.kind == kind and job.is_active:
+                    return job, False
+
+            job = Job(kind, func, params)
+            if self.store:
+                running_elsewhere = self.store.claim(job)
+                if running_elsewhere:
+                    return running_elsewhere, False
+
+            self._jobs[job.id] = job
+            self._trim_history()
+            self._queue.put(job)
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name=f'{self.name}-worker', daemon=True)
+                self._worker.start()
+            if self.store and (self._heartbeat is None or not self._heartbeat.is_alive()):
+                self._heartbeat = threading.Thread(target=self._beat, name=f'{self.name}-heartbeat', daemon=True)
+                self._heartbeat.start()
+
+            return job, True
+
+    def get(self, job_id):
+        """Look up a job by ID, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.store:
+            job = self.store.load(job_id)
+        return job
+
+    def active_job(self, kind):
+        """Return the queued or running job of this kind, if any."""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.kind == kind and job.is_active:
+                    return job
+        if self.store:
+            return self.store.active(kind)
+        return None
+
+    def _trim_history(self):
+        while len(self._jobs) > self.max_history:
+            oldest_id = next(iter(self._jobs))
+            if self._jobs[oldest_id].is_active:
+                break
+            self._jobs.pop(oldest_id)
+
+    def _save(self, job):
+        if self.store:
+            self.store.save(job)
+
+    def _beat(self):
+        while True:
+            time.sleep(self.store.heartbeat)
+            with self._lock:
+                active = [job for job in self._jobs.values() if job.is_active]
+            for job in active:
+                self.store.save(job)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            job.started_date = datetime.utcnow()
+            self._save(job)
+            try:
+                job.result = job.func(job, **job.params)
+                job.status = 'succeeded'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+                print(f"{self.name} job {job.id} failed: {e}")
+                traceback.print_exc()
+            finally:
+                job.finished_date = datetime.utcnow()
+                self._save(job)
+                job._done.set()
+                self._queue.task_done()
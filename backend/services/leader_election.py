@@ -0,0 +1,148 @@
+"""Database-backed lease so only one process runs the scheduled jobs."""
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, or_, update
+from sqlalchemy.exc import IntegrityError
+
+
+class LeaderLease:
+    """A named lease row that one process at a time may hold.
+
+    Every process runs the scheduler, but only the lease holder does the
+    scheduled work. The holder renews the lease every heartbeat seconds; if
+    it dies or loses the database, the lease expires after ttl seconds and
+    the next process to heartbeat takes over.
+
+    A process only considers itself leader until ttl seconds after its last
+    successful renewal, measured on its own clock. The row itself expires no
+    earlier than that, so two processes never both believe they lead.
+    """
+
+    def __init__(self, name='scheduler', ttl=None, heartbeat=None):
+        self.name = name
+        self.ttl = ttl or int(os.getenv('SCHEDULER_LEASE_TTL', 90))
+        self.heartbeat = heartbeat or int(os.getenv('SCHEDULER_HEARTBEAT_INTERVAL', 30))
+        self.holder_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self):
+        return time.monotonic() < self._valid_until
+
+    def try_acquire(self):
+        """Take or renew the lease if it is free, expired or already ours."""
+        from models.database import SessionLocal, SchedulerLease
+
+        attempted = time.monotonic()
+        now = datetime.utcnow()
+        was_leader = self.is_leader
+        session = SessionLocal()
+
+        try:
+            result = session.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(
+                        SchedulerLease.holder == self.holder_id,
+                        SchedulerLease.holder.is_(None),
+                        SchedulerLease.expires_date < now
+                    )
+                )
+                .values(
+                    holder=self.holder_id,
+                    acquired_date=case(
+                        (SchedulerLease.holder == self.holder_id, SchedulerLease.acquired_date),
+                        else_=now
+                    ),
+                    heartbeat_date=now,
+                    expires_date=now + timedelta(seconds=self.ttl)
+                )
+            )
+            acquired = result.rowcount == 1
+
+            if not acquired and session.query(SchedulerLease.id).filter_by(name=self.name).first() is None:
+                session.add(SchedulerLease(
+                    name=self.name,
+                    holder=self.holder_id,
+                    acquired_date=now,
+                    heartbeat_date=now,
+                    expires_date=now + timedelta(seconds=self.ttl)
+                ))
+                acquired = True
+
+            session.commit()
+        except IntegrityError:
+            # Another process created the lease row first
+            session.rollback()
+            acquired = False
+        except Exception as e:
+            session.rollback()
+            print(f"Error renewing {self.name} lease: {e}")
+            return self.is_leader
+        finally:
+            session.close()
+
+        if acquired:
+            self._valid_until = attempted + self.ttl
+            if not was_leader:
+                print(f"Acquired {self.name} lease as {self.holder_id}")
+        else:
+            self._valid_until = 0.0
+            if was_leader:
+                print(f"Lost {self.name} lease")
+
+        return acquired
+
+    def release(self):
+        """Give the lease up so another process can take over straight away."""
+        from models.database import SessionLocal, SchedulerLease
+
+        if not self.is_leader:
+            return
+        self._valid_until = 0.0
+
+        session = SessionLocal()
+        try:
+            session.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder_id)
+                .values(holder=None, expires_date=None)
+            )
+            session.commit()
+            print(f"Released {self.name} lease")
+        except Exception as e:
+            session.rollback()
+            print(f"Error releasing {self.name} lease: {e}")
+        finally:
+            session.close()
+
+    def start(self):
+        """Start heartbeating in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.try_acquire()
+        self._thread = threading.Thread(target=self._run, name=f'{self.name}-lease', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop heartbeating and release the lease."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.heartbeat)
+        self.release()
+
+    def _run(self):
+        while not self._stop.wait(self.heartbeat):
+            self.try_acquire()
+
+
+scheduler_lease = LeaderLease()
@@ -0,0 +1,212 @@
+"""Keyset (cursor) pagination and cached row counts for listing endpoints."""
+import base64
+import binascii
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import and_, false, or_
+
+from services.data_version import data_versions
+
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded."""
+
+
+def encode_cursor(direction, values):
+    """Pack a page boundary into an opaque, URL-safe token."""
+    payload = {
+        'd': direction,
+        'k': [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, key_count):
+    """Unpack a cursor into (direction, values)."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        direction = payload['d']
+        values = [datetime.fromisoformat(v['dt']) if isinstance(v, dict) else v for v in payload['k']]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {e}')
+
+    if direction not in ('next', 'prev') or len(values) != key_count:
+        raise InvalidCursor('Invalid cursor')
+    return direction, values
+
+
+def _order_by(column, descending, reverse):
+    # NULLs sort as the smallest value, as SQLite does natively, so an index
+    # on the sort keys can be walked in either direction
+    if descending != reverse:
+        return column.desc().nulls_last()
+    return column.asc().nulls_first()
+
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+
+def _past(column, descending, value, reverse):
+    """Rows strictly after value in the (possibly reversed) sort order of one key."""
+    if descending != reverse:
+        if value is None:
+            return false()
+        return or_(column < value, column.is_(None))
+
+    if value is None:
+        return column.isnot(None)
+    return column > value
+
+
+def _seek(sort_keys, values, reverse):
+    """Lexicographic "after this row" condition over all the sort keys."""
+    clauses = []
+    for i, (column, descending) in enumerate(sort_keys):
+        prefix = [_equal(col, value) for (col, _), value in zip(sort_keys[:i], values[:i])]
+        clauses.append(and_(*prefix, _past(column, descending, values[i], reverse)))
+    return or_(*clauses)
+
+
+def _segments(sort_keys, values, reverse):
+    """WHERE clauses for the non-NULL and NULL runs of the leading key, in page order.
+
+    An OR with "IS NULL" on the leading key stops the database from turning
+    the seek into an index range, so the two runs are fetched separately:
+    non-NULL rows with a plain range bound, and NULL rows by equality.
+    """
+    column, descending = sort_keys[0]
+    nulls_last = descending != reverse
+    non_null, null = column.isnot(None), column.is_(None)
+
+    if values is None:
+        return [non_null, null] if nulls_last else [null, non_null]
+
+    if values[0] is None:
+        # Starting inside the NULL run; non-NULL rows only follow when reversed
+        runs = [and_(null, _seek(sort_keys[1:], values[1:], reverse))]
+        if not nulls_last:
+            runs.append(non_null)
+    else:
+        bound = column <= values[0] if nulls_last else column >= values[0]
+        runs = [and_(non_null, bound, _seek(sort_keys, values, reverse))]
+        if nulls_last:
+            runs.append(null)
+
+    return runs
+
+
+def keyset_paginate(query, sort_keys, per_page, cursor=None):
+    """Return one page of query and the cursors around it.
+
+    sort_keys is a list of (column, descending) pairs that must end in a
+    unique column (the primary key) so every row has a distinct position.
+    Instead of skipping rows with OFFSET, the page starts right after the
+    row a cursor points at, so deep pages cost the same as the first.
+    """
+    direction, values = decode_cursor(cursor, len(sort_keys)) if cursor else ('next', None)
+    reverse = direction == 'prev'
+    ordering = [_order_by(column, descending, reverse) for column, descending in sort_keys]
+
+    rows = []
+    for condition in _segments(sort_keys, values, reverse):
+        rows.extend(query.filter(condition).order_by(*ordering).limit(per_page + 1 - len(rows)).all())
+        if len(rows) > per_page:
+            break
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if reverse:
+        rows.reverse()
+
+    has_next = True if reverse else has_more
+    has_prev = has_more if reverse else values is not None
+
+    def position(row):
+        return [getattr(row, column.key) for column, _ in sort_keys]
+
+    return rows, {
+        'per_page': per_page,
+        'has_next': bool(rows) and has_next,
+        'has_prev': bool(rows) and has_prev,
+        'next_cursor': encode_cursor('next', position(rows[-1])) if rows and has_next else None,
+        'prev_cursor': encode_cursor('prev', position(rows[0])) if rows and has_prev else None
+    }
+
+
+class CountCache:
+    """Short-lived cache of COUNT(*) results per listing and filter set.
+
+    Counting the whole table on every page request is the expensive part of
+    offset pagination; a total that is up to ttl seconds stale is fine for
+    page counts.
+    """
+
+    def __init__(self, ttl=None, max_entries=256):
+        self.ttl = ttl if ttl is not None else float(os.getenv('PAGINATION_COUNT_TTL', 60))
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def count(self, key, query):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                return entry[0]
+
+        total = query.order_by(None).count()
+
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (total, now + self.ttl)
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
+# New data makes the cached totals wrong; drop them as soon as it is seen
+data_versions.subscribe(count_cache.clear)
+
+
+def paginate_listing(query, sort_keys, args, cache_key, default_per_page):
+    """Paginate a listing endpoint from its request args.
+
+    With ?cursor=... (or no ?page=) this is keyset pagination and the total
+    is only counted when ?include_total=true. ?page=N keeps the old offset
+    pagination for existing clients. Returns (rows, pagination dict).
+    """
+    per_page = min(max(args.get('per_page', default_per_page, type=int), 1), MAX_PER_PAGE)
+    cursor = args.get('cursor')
+    page = args.get('page', type=int)
+    include_total = args.get('include_total', 'false').lower() == 'true'
+
+    if cursor or page is None:
+        rows, pagination = keyset_paginate(query, sort_keys, per_page, cursor)
+    else:
+        page = max(page, 1)
+        order = [_order_by(column, descending, False) for column, descending in sort_keys]
+        rows = query.order_by(*order).limit(per_page).offset((page - 1) * per_page).all()
+        pagination = {'page': page, 'per_page': per_page}
+        include_total = True
+
+    if include_total:
+        total = count_cache.count(cache_key, query)
+        pagination['total'] = total
+        pagination['pages'] = (total + per_page - 1) // per_page
+
+    return rows, pagination
@@ -0,0 +1,63 @@
+"""Batched persistence helpers for scraped news and events."""
+from sqlalchemy import insert, select
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+def find_existing_urls(db, model, urls):
+    """Return the subset of urls already stored for model."""
+    urls = list(urls)
+    existing = set()
+    for i in range(0, len(urls), LOOKUP_BATCH_SIZE):
+        chunk = urls[i:i + LOOKUP_BATCH_SIZE]
+        existing.update(db.scalars(select(model.url).where(model.url.in_(chunk))))
+    return existing
+
+
+def filter_new_items(db, model, items):
+    """Drop items without a URL, repeats within the batch and rows already stored."""
+    unique_items = []
+    seen = set()
+    for item in items:
+        url = item.get('url')
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        unique_items.append(item)
+
+    existing = find_existing_urls(db, model, seen)
+    return [item for item in unique_items if item['url'] not in existing]
+
+
+def insert_skipping_conflicts(db, model):
+    """Build an INSERT that skips rows hitting a unique constraint, where supported.
+
+    Both news and events have a unique index on url, so a row stored by a
+    concurrent scrape since filter_new_items ran is skipped, not duplicated.
+    Data version counters use it to create their rows.
+    """
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+
+def bulk_insert(db, model, items):
+    """Insert scraped items in a single executemany and return how many were stored."""
+    if not items:
+        return 0
+
+    columns = {column.key for column in model.__table__.columns}
+    keys = sorted({key for item in items for key in item if key in columns})
+    rows = [{key: item.get(key) for key in keys} for item in items]
+
+    # A Core execute on the session's connection, so rowcount is available;
+    # it leaves out rows skipped by ON CONFLICT DO NOTHING
+    result = db.connection().execute(insert_skipping_conflicts(db, model), rows)
+    return result.rowcount
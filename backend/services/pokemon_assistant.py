@@ -1,6 +1,5 @@
 """AI-powered Pokemon GO assistant using Claude."""
 import os
-from anthropic import Anthropic
 
 
 class PokemonAssistant:
@@ -12,6 +11,7 @@ class PokemonAssistant:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
 
+        from anthropic import Anthropic
         self.client = Anthropic(api_key=api_key)
         self.model = "claude-3-haiku-20240307"  # Using Haiku - fast and efficient
 
@@ -0,0 +1,155 @@
+"""Raid boss and counter ingestion shared by the scheduler and the refresh API."""
+import time
+from datetime import datetime
+
+from models.database import SessionLocal, RaidBoss
+from services.boss_index import boss_index
+from services.counter_reconciler import reconcile_counters
+from services.data_version import bump_data_version, RAIDS
+from services.jobs import JobRunner, JobStore
+from services.raid_refresh_queue import RaidRefreshQueue
+
+
+def ingest_raid_entries(db, raid_data):
+    """Upsert scraped bosses and reconcile their counters.
+
+    Entries with no counters are skipped: an empty scrape means the page
+    failed to load (browser crash, timeout, unknown boss), not that the
+    boss has no counters, so the stored boss and counters are kept.
+    Returns (added, updated, counters_changed).
+    """
+    boss_columns = {column.key for column in RaidBoss.__table__.columns} - {'id'}
+    updated_count = 0
+    added_count = 0
+    counters_changed = 0
+
+    # Process each raid boss and its counters
+    for raid_entry in raid_data:
+        boss_data = {
+            key: value for key, value in raid_entry.get('boss_data', {}).items()
+            if key in boss_columns
+        }
+        counters_data = raid_entry.get('counters', [])
+
+        if not boss_data.get('name'):
+            continue
+
+        if not counters_data:
+            print(f"No counters scraped for {boss_data['name']}, keeping stored data")
+            continue
+
+        # Check if raid boss already exists
+        existing_boss = db.query(RaidBoss).filter_by(name=boss_data['name']).first()
+
+        if existing_boss:
+            # Update existing boss
+            for key, value in boss_data.items():
+                setattr(existing_boss, key, value)
+            existing_boss.last_updated = datetime.utcnow()
+            raid_boss = existing_boss
+            updated_count += 1
+        else:
+            # Create new boss
+            raid_boss = RaidBoss(**boss_data)
+            db.add(raid_boss)
+            db.flush()  # Get the ID
+            added_count += 1
+
+        # Only write the counters that actually changed
+        changes = reconcile_counters(db, raid_boss.id, counters_data)
+        counters_changed += changes['inserted'] + changes['updated'] + changes['deleted']
+
+    return added_count, updated_count, counters_changed
+
+
+def run_raid_refresh(job, force_discovery=False):
+    """Refresh counters for the most urgent bosses within one time slice.
+
+    Works through the refresh queue for at most RAID_REFRESH_TIME_SLICE
+    seconds, committing after every batch so progress survives a crash.
+    """
+    from scrapers.pokebattler import PokebattlerScraper
+
+    db = SessionLocal()
+    scraper = PokebattlerScraper()
+    refresh_queue = RaidRefreshQueue()
+    started = time.monotonic()
+
+    try:
+        # Refresh the list of current bosses every RAID_SCRAPE_INTERVAL hours
+        if force_discovery or refresh_queue.needs_discovery(db):
+            job.update_progress(stage='discovering bosses')
+            raid_bosses = scraper.scrape_raid_bosses()
+            if raid_bosses:
+                refresh_queue.enqueue(db, raid_bosses)
+            elif not refresh_queue.prioritized(db):
+                print("No raid bosses found. Using fallback approach...")
+                refresh_queue.enqueue(db, [dict(boss) for boss in scraper.FALLBACK_BOSSES])
+            db.commit()
+
+        targets = [refresh_queue.as_scrape_target(entry) for entry in refresh_queue.prioritized(db)]
+        deadline = started + refresh_queue.time_slice
+        batch_size = scraper.pool.max_size
+
+        result = {'added': 0, 'updated': 0, 'counters_changed': 0, 'processed': 0, 'queued': len(targets)}
+        job.update_progress(stage='scraping counters', processed=0, total=len(targets))
+
+        # One boss per pooled browser per batch, until the time slice runs
+        # out (always at least one batch, so every tick makes progress)
+        for i in range(0, len(targets), batch_size):
+            if result['processed'] and time.monotonic() >= deadline:
+                break
+
+            batch = targets[i:i + batch_size]
+            raid_data = scraper.scrape_bosses(batch)
+
+            added, updated, changed = ingest_raid_entries(db, raid_data)
+            refresh_queue.mark_attempted(db, [boss['name'] for boss in batch])
+            if added or updated or changed:
+                bump_data_version(db, RAIDS)
+            db.commit()
+
+            result['added'] += added
+            result['updated'] += updated
+            result['counters_changed'] += changed
+            result['processed'] += len(batch)
+            job.update_progress(processed=result['processed'])
+
+        # Autocomplete picks up new and retired bosses straight away
+        boss_index.load(db)
+
+        print(f"Raid scraping complete: {result['added']} added, {result['updated']} updated, "
+              f"{result['counters_changed']} counter rows changed, "
+              f"{result['processed']}/{len(targets)} bosses in {time.monotonic() - started:.0f}s")
+        return result
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class RaidIngestionService:
+    """Accept raid refresh requests and run them on one background worker.
+
+    Only one refresh is ever in flight, across all worker processes:
+    requests that arrive while one is queued or running get that job back
+    instead of starting another scrape, and any worker can report on it.
+    """
+
+    JOB_KIND = 'raid_refresh'
+
+    def __init__(self):
+        self.runner = JobRunner('raid-ingestion', store=JobStore())
+
+    def submit_refresh(self, force_discovery=False):
+        """Queue a refresh unless one is in flight. Returns (job, created)."""
+        return self.runner.submit(self.JOB_KIND, run_raid_refresh, force_discovery=force_discovery)
+
+    def get_job(self, job_id):
+        return self.runner.get(job_id)
+
+
+# Shared by the scheduler and the API in this process
+raid_ingestion = RaidIngestionService()
@@ -0,0 +1,155 @@
+"""Persistent, prioritized queue of raid bosses waiting for a counters refresh."""
+import math
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, update
+
+from models.database import RaidBoss, RaidRefreshEntry
+
+# Active bosses are this many times more urgent than inactive ones
+ACTIVE_WEIGHT = 3.0
+# Bosses never refreshed sort ahead of everything else
+NEVER_REFRESHED_HOURS = 10 ** 6
+
+
+class RaidRefreshQueue:
+    """Decide which bosses to refresh next.
+
+    Each boss's priority grows with the hours since it was last refreshed
+    (or attempted), is multiplied for bosses currently in raids, and scales
+    with how often its counters are requested. Every scheduler tick works
+    down the queue for a bounded time slice; the bosses it reaches drop to
+    the back, so the next tick resumes with whatever is now most stale.
+    """
+
+    def __init__(self, time_slice=None, discovery_hours=None):
+        self.time_slice = time_slice or float(os.getenv('RAID_REFRESH_TIME_SLICE', 300))
+        self.discovery_interval = timedelta(hours=discovery_hours or float(os.getenv('RAID_SCRAPE_INTERVAL', 6)))
+
+    def needs_discovery(self, db):
+        """True when the current boss list hasn't been fetched recently."""
+        last_discovery = db.query(func.max(RaidRefreshEntry.discovered_date)).scalar()
+        return last_discovery is None or last_discovery < datetime.utcnow() - self.discovery_interval
+
+    def enqueue(self, db, raid_bosses):
+        """Add or update bosses from the raids listing; others are marked inactive."""
+        now = datetime.utcnow()
+        entries = {entry.boss_name: entry for entry in db.query(RaidRefreshEntry).all()}
+        listed = set()
+
+        for boss in raid_bosses:
+            name = boss.get('name')
+            if not name:
+                continue
+            listed.add(name)
+            entry = entries.get(name)
+            if not entry:
+                entry = RaidRefreshEntry(boss_name=name, request_count=0)
+                db.add(entry)
+                entries[name] = entry
+            entry.tier = boss.get('tier', entry.tier)
+            entry.is_active = boss.get('is_active', True)
+            entry.hint_url = boss.get('url', entry.hint_url)
+            entry.discovered_date = now
+
+        # Bosses already in the database are kept in rotation, just at lower priority
+        for (name,) in db.query(RaidBoss.name).all():
+            if name not in entries:
+                entry = RaidRefreshEntry(boss_name=name, request_count=0, is_active=False, discovered_date=now)
+                db.add(entry)
+                entries[name] = entry
+
+        for name, entry in entries.items():
+            if name not in listed:
+                entry.is_active = False
+
+    def prioritized(self, db):
+        """Return queue entries, most urgent first."""
+        now = datetime.utcnow()
+        last_updated = dict(db.query(RaidBoss.name, RaidBoss.last_updated).all())
+
+        def priority(entry):
+            seen = [t for t in (last_updated.get(entry.boss_name), entry.last_attempted) if t]
+            staleness = (now - max(seen)).total_seconds() / 3600 if seen else NEVER_REFRESHED_HOURS
+            weight = ACTIVE_WEIGHT if entry.is_active else 1.0
+            return staleness * weight * (1 + math.log1p(entry.request_count or 0))
+
+        return sorted(db.query(RaidRefreshEntry).all(), key=priority, reverse=True)
+
+    @staticmethod
+    def mark_attempted(db, boss_names):
+        """Record that the bosses were just processed, successfully or not."""
+        if boss_names:
+            db.execute(
+                update(RaidRefreshEntry)
+                .where(RaidRefreshEntry.boss_name.in_(list(boss_names)))
+                .values(last_attempted=datetime.utcnow())
+            )
+
+    @staticmethod
+    def record_request(db, boss_name, count=1):
+        """Count counters lookups towards the boss's refresh priority."""
+        db.execute(
+            update(RaidRefreshEntry)
+            .where(RaidRefreshEntry.boss_name == boss_name)
+            .values(
+                request_count=RaidRefreshEntry.request_count + count,
+                last_requested=datetime.utcnow()
+            )
+        )
+
+    @staticmethod
+    def as_scrape_target(entry):
+        """Convert a queue entry into the boss dict the scraper expects."""
+        boss = {'name': entry.boss_name, 'is_active': bool(entry.is_active)}
+        if entry.tier:
+            boss['tier'] = entry.tier
+        if entry.hint_url:
+            boss['url'] = entry.hint_url
+        return boss
+
+
+class RequestTally:
+    """Counters lookups counted in memory and recorded in batches.
+
+    Cached counters responses are served without touching the database, so
+    lookups are tallied here and written at most every flush_interval
+    seconds, in one short transaction.
+    """
+
+    def __init__(self, flush_interval=None):
+        self.flush_interval = flush_interval or float(os.getenv('RAID_REQUEST_FLUSH_SECONDS', 60))
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def add(self, boss_name):
+        with self._lock:
+            self._counts[boss_name] += 1
+            due = time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        from models.database import session_scope
+
+        with self._lock:
+            pending, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return
+
+        try:
+            with session_scope() as session:
+                for boss_name, count in pending.items():
+                    RaidRefreshQueue.record_request(session, boss_name, count)
+        except Exception as e:
+            print(f"Error recording counters requests: {e}")
+
+
+# Shared by the counters endpoint in this process
+request_tally = RequestTally()
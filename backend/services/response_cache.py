@@ -0,0 +1,123 @@
+"""Cache of serialized read-endpoint responses, validated by ETag."""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, g, make_response, request
+
+from services.data_version import data_versions
+
+
+class CachedResponse:
+    def __init__(self, versions, body, mimetype, tag, expires):
+        self.versions = versions
+        self.body = body
+        self.mimetype = mimetype
+        self.tag = tag
+        self.expires = expires
+        # Strong validator: the same ETag always means the same bytes
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+
+
+class ResponseCache:
+    """Least recently used response bodies, each tied to the data versions it was built from.
+
+    An entry is served only while the data versions match, and for at most
+    ttl seconds, which bounds how stale a response can be when data is
+    changed outside the jobs that bump versions (or by a date rolling over,
+    like the calendar's default month).
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = max_entries or int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512))
+        self.ttl = ttl if ttl is not None else float(os.getenv('RESPONSE_CACHE_TTL', 300))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, versions):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.versions == versions and entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, key, versions, body, mimetype, tag=None):
+        entry = CachedResponse(versions, body, mimetype, tag, time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+response_cache = ResponseCache()
+
+
+def _cache_key(view_args):
+    """The route plus its URL and query arguments, independent of argument order."""
+    args = tuple(sorted(
+        (name, tuple(sorted(value for value in values if value)))
+        for name, values in request.args.lists()
+        if any(values)
+    ))
+    return request.endpoint, tuple(sorted(view_args.items())), args
+
+
+def _conditional(entry):
+    response = Response(entry.body, mimetype=entry.mimetype)
+    response.set_etag(entry.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = int(os.getenv('RESPONSE_CACHE_MAX_AGE', 30))
+    response.cache_control.must_revalidate = True
+    # Turns the response into a bodiless 304 when If-None-Match has this ETag
+    return response.make_conditional(request)
+
+
+def cached_response(*data, on_hit=None):
+    """Serve a GET endpoint from the response cache while the named data is unchanged.
+
+    data names the version counters the response depends on (see
+    services.data_version). Only 200 responses are cached. A view can set
+    g.response_cache_tag to keep a value with the cached entry; on_hit(tag)
+    is then called whenever the entry is served, for side effects the
+    cached response would otherwise skip.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+
+            key = _cache_key(kwargs)
+            versions = data_versions.current(data)
+            entry = response_cache.get(key, versions)
+
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = response_cache.put(key, versions, response.get_data(), response.mimetype,
+                                           g.pop('response_cache_tag', None))
+            elif on_hit:
+                on_hit(entry.tag)
+
+            return _conditional(entry)
+        return wrapper
+    return decorator
@@ -1,11 +1,27 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from dateutil import parser as date_parser
+import atexit
 import os
+import time
+from functools import wraps
 
+from services.jobs import JobRunner, JobStore
+from services.leader_election import scheduler_lease
 
-def scrape_all_sources():
-    """Background job to scrape all news sources."""
+SCRAPE_JOB_KIND = 'scrape_all_sources'
+
+# Runs scrapes one at a time; requests made while one is running, in any
+# worker process, join it
+scrape_jobs = JobRunner('scrape', store=JobStore())
+
+
+def scrape_all_sources(job=None):
+    """Scrape all news sources and save anything new.
+
+    When run as a job, per-source progress and item counts are reported
+    through job.update_progress as the scrape goes. Returns a summary of the run.
+    """
     from scrapers import (
         LeekDuckScraper,
         OfficialBlogScraper,
@@ -13,184 +29,256 @@ def scrape_all_sources():
         SerebiiScraper,
         PokemonGoHubScraper
     )
-    from models.database import get_db, NewsItem, Event
+    from scrapers.fetch_memo import fetch_memo
+    from scrapers.http_cache import http_cache
+    from models.database import SessionLocal, session_scope, NewsItem, Event
     from services.summarizer import AISummarizer
+    from services.scrape_executor import ScrapeExecutor, ScrapeTask
+    from services.persistence import filter_new_items, bulk_insert
+    from services.data_version import bump_data_version, NEWS, EVENTS
+    from services.calendar_store import refresh_months, months_for_events
+    from services.summarization_stage import SummarizationStage
 
     print("Starting scheduled scraping...")
 
-    db = get_db()
+    report = job.update_progress if job else (lambda *path, **values: None)
+    report(stage='fetching', sources={})
+
+    db = SessionLocal()
     summarizer = AISummarizer()
 
     # Initialize scrapers
-    leekduck = LeekDuckScraper()
-    official = OfficialBlogScraper()
-    silph = SilphRoadScraper()
-    serebii = SerebiiScraper()
-    pokemongohub = PokemonGoHubScraper()
+    scrapers = {
+        'LeekDuck': LeekDuckScraper(),
+        'Official Blog': OfficialBlogScraper(),
+        'Silph Road': SilphRoadScraper(),
+        'Serebii': SerebiiScraper(),
+        'Pokemon GO Hub': PokemonGoHubScraper()
+    }
+
+    # Scrape events and news from every source concurrently. Both kinds
+    # share the memo, so each page or feed is only downloaded once.
+    tasks = []
+    for source, scraper in scrapers.items():
+        tasks.append(ScrapeTask(source, 'events', scraper.scrape_events))
+        tasks.append(ScrapeTask(source, 'news', scraper.scrape_news))
+
+    def report_task(task):
+        report('sources', task.source, **{task.kind: {
+            'status': task.status,
+            'items': len(task.result),
+            'elapsed': round(task.elapsed, 2)
+        }})
+
+    for task in tasks:
+        report_task(task)
+
+    # Validators kept from before are only trusted if the pages' items are
+    # still in the database; with an empty table fetch everything in full
+    conditional = db.query(Event.id).first() is not None and db.query(NewsItem.id).first() is not None
+
+    executor = ScrapeExecutor()
+    started = time.monotonic()
+    with fetch_memo.cycle(), http_cache.cycle(conditional=conditional):
+        executor.run(tasks, on_task_done=report_task)
+
+    for task in tasks:
+        report_task(task)
+    print(f"Fetched all sources in {time.monotonic() - started:.2f}s:")
+    executor.print_report(tasks)
 
-    # Scrape events
     all_events = []
-    all_events.extend(leekduck.scrape_events())
-    all_events.extend(official.scrape_events())
-    all_events.extend(silph.scrape_events())
-    all_events.extend(serebii.scrape_events())
-    all_events.extend(pokemongohub.scrape_events())
-
-    # Scrape news
     all_news = []
-    all_news.extend(leekduck.scrape_news())
-    all_news.extend(official.scrape_news())
-    all_news.extend(silph.scrape_news())
-    all_news.extend(serebii.scrape_news())
-    all_news.extend(pokemongohub.scrape_news())
-
-    # Save events to database
-    new_events_count = 0
-    for event_data in all_events:
-        try:
-            # Check if event already exists by URL
-            existing = db.query(Event).filter_by(url=event_data.get('url')).first()
-            if not existing:
-                # Generate summary if not exists
-                if not event_data.get('summary'):
-                    event_data['summary'] = summarizer.summarize_event(
-                        event_data.get('title', ''),
-                        event_data.get('description', '')
-                    )
-
-                event = Event(**event_data)
-                db.add(event)
-                new_events_count += 1
-        except Exception as e:
-            print(f"Error saving event: {e}")
-            continue
-
-    # Save news to database
-    new_news_count = 0
-    for news_data in all_news:
-        try:
-            # Check if news already exists by URL
-            existing = db.query(NewsItem).filter_by(url=news_data.get('url')).first()
-            if not existing:
-                # Generate summary if not exists
-                if not news_data.get('summary'):
-                    news_data['summary'] = summarizer.summarize_news(
-                        news_data.get('title', ''),
-                        news_data.get('content', '')
-                    )
-
-                # Parse published_date if it's a string
-                if news_data.get('published_date') and isinstance(news_data['published_date'], str):
-                    try:
-                        news_data['published_date'] = date_parser.parse(news_data['published_date'])
-                    except:
-                        news_data['published_date'] = None
-
-                news = NewsItem(**news_data)
-                db.add(news)
-                new_news_count += 1
-        except Exception as e:
-            print(f"Error saving news: {e}")
-            continue
-
-    db.commit()
-    db.close()
+    for task in tasks:
+        if task.kind == 'events':
+            all_events.extend(task.result)
+        else:
+            all_news.extend(task.result)
+
+    report(stage='saving', scraped_events=len(all_events), scraped_news=len(all_news))
+
+    # Drop items already stored, using one IN (...) lookup per table
+    new_events = filter_new_items(db, Event, all_events)
+    new_news = filter_new_items(db, NewsItem, all_news)
+
+    # Save with a fallback summary now; the AI summary is filled in afterwards
+    summary_stage = SummarizationStage(summarizer)
+    summary_jobs = []
+
+    for event_data in new_events:
+        if not event_data.get('summary'):
+            summary_jobs.append(summary_stage.make_job(Event, event_data, 'event'))
+
+    for news_data in new_news:
+        if not news_data.get('summary'):
+            summary_jobs.append(summary_stage.make_job(NewsItem, news_data, 'news'))
+
+        # Parse published_date if it's a string
+        if news_data.get('published_date') and isinstance(news_data['published_date'], str):
+            try:
+                news_data['published_date'] = date_parser.parse(news_data['published_date'])
+            except (ValueError, OverflowError):
+                news_data['published_date'] = None
+        elif not news_data.get('published_date'):
+            news_data['published_date'] = None
+
+    # Save everything new in one batch per table
+    try:
+        new_events_count = bulk_insert(db, Event, new_events)
+        new_news_count = bulk_insert(db, NewsItem, new_news)
+        changed = [name for name, count in ((EVENTS, new_events_count), (NEWS, new_news_count)) if count]
+        if changed:
+            bump_data_version(db, *changed)
+        # Only the calendar months the new events fall in need rebuilding
+        calendar_months = months_for_events(new_events)
+        refresh_months(db, calendar_months)
+        db.commit()
+    except Exception:
+        db.rollback()
+        http_cache.discard()
+        raise
+    finally:
+        db.close()
+
+    # Only remember validators once the content is saved, and only for
+    # pages whose tasks yielded items. A page behind a failed, empty or
+    # abandoned task is fetched in full next time.
+    http_cache.commit(ScrapeExecutor.succeeded(tasks))
+
+    report(new_events=new_events_count, new_news=new_news_count)
 
+    # Upgrade the fallback summaries in parallel
+    report(stage='summarizing', summaries_pending=len(summary_jobs))
+    summary_stats = summary_stage.run(summary_jobs)
+    if summary_stats['upgraded']:
+        with session_scope() as session:
+            bump_data_version(session, NEWS, EVENTS)
+            # The calendar shows summaries too
+            refresh_months(session, calendar_months)
+    summarizer.cache.prune()
+
+    report(stage='done')
     print(f"Scraping complete: {new_events_count} new events, {new_news_count} new news items")
 
+    return {
+        'new_events': new_events_count,
+        'new_news': new_news_count,
+        'summaries': summary_stats,
+        'sources': ScrapeExecutor.timing_report(tasks)
+    }
+
+
+def submit_scrape():
+    """Queue a scrape of all sources unless one is in flight. Returns (job, created)."""
+    return scrape_jobs.submit(SCRAPE_JOB_KIND, scrape_all_sources)
+
+
+def run_scheduled_scrape():
+    """Scheduler entry point: run a scrape, or wait for the one already running in any worker."""
+    job, created = submit_scrape()
+    if not created:
+        print(f"Scrape {job.id} already in progress, waiting for it")
+    job.wait()
+
+    if job.status == 'failed':
+        print(f"Error scraping sources: {job.error}")
+
 
 def scrape_raid_data():
-    """Background job to scrape Pokebattler raid data."""
-    from scrapers.pokebattler import PokebattlerScraper
-    from models.database import get_db, RaidBoss, RaidCounter
-    from datetime import datetime
+    """Background job to refresh Pokebattler raid data.
+
+    Goes through the raid ingestion service, so a manual refresh that is
+    already running is waited on rather than duplicated.
+    """
+    from services.raid_ingestion import raid_ingestion
 
     print("Starting scheduled raid data scraping...")
 
-    db = get_db()
-    scraper = PokebattlerScraper()
+    job, created = raid_ingestion.submit_refresh()
+    if not created:
+        print(f"Raid refresh {job.id} already in progress, waiting for it")
+    job.wait()
 
-    try:
-        # Scrape all raids and counters
-        raid_data = scraper.scrape_all_raids_and_counters()
-
-        updated_count = 0
-        added_count = 0
-
-        # Process each raid boss and its counters
-        for raid_entry in raid_data:
-            boss_data = raid_entry.get('boss_data', {})
-            counters_data = raid_entry.get('counters', [])
-
-            if not boss_data.get('name'):
-                continue
-
-            # Check if raid boss already exists
-            existing_boss = db.query(RaidBoss).filter_by(name=boss_data['name']).first()
-
-            if existing_boss:
-                # Update existing boss
-                for key, value in boss_data.items():
-                    if hasattr(existing_boss, key) and key != 'id':
-                        setattr(existing_boss, key, value)
-                existing_boss.last_updated = datetime.utcnow()
-                raid_boss = existing_boss
-                updated_count += 1
-            else:
-                # Create new boss
-                raid_boss = RaidBoss(**boss_data)
-                db.add(raid_boss)
-                db.flush()  # Get the ID
-                added_count += 1
-
-            # Delete old counters for this boss
-            db.query(RaidCounter).filter_by(raid_boss_id=raid_boss.id).delete()
-
-            # Add new counters
-            for counter_data in counters_data:
-                counter_data['raid_boss_id'] = raid_boss.id
-                counter = RaidCounter(**counter_data)
-                db.add(counter)
+    if job.status == 'failed':
+        print(f"Error scraping raid data: {job.error}")
 
-        db.commit()
-        print(f"Raid scraping complete: {added_count} added, {updated_count} updated")
 
+def run_database_maintenance():
+    """Background job to keep the SQLite database compact and its planner statistics fresh."""
+    from models.database import engine
+    from models.sqlite_tuning import run_sqlite_maintenance
+
+    try:
+        report = run_sqlite_maintenance(engine)
+        print(f"Database maintenance complete: {report}")
     except Exception as e:
-        print(f"Error scraping raid data: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        print(f"Error running database maintenance: {e}")
+
+
+def leader_only(func):
+    """Skip a scheduled job unless this process holds the scheduler lease."""
+    @wraps(func)
+    def wrapper():
+        if not scheduler_lease.is_leader:
+            print(f"Skipping {func.__name__}: another process holds the scheduler lease")
+            return None
+        return func()
+    return wrapper
 
 
 def setup_scheduler():
-    """Set up the background scheduler for periodic scraping."""
+    """Set up the background scheduler for periodic scraping.
+
+    Every process runs the scheduler, but the jobs only do work in the one
+    holding the scheduler lease, so running several workers doesn't multiply
+    scrapes. If the leader goes away another process takes over once its
+    lease expires.
+    """
     scheduler = BackgroundScheduler()
 
+    scheduler_lease.start()
+    atexit.register(scheduler_lease.stop)
+
     # Get scraping interval from environment (default 30 minutes)
     interval_minutes = int(os.getenv('SCRAPE_INTERVAL', 30))
 
     # Schedule scraping job for news and events
     scheduler.add_job(
-        func=scrape_all_sources,
+        func=leader_only(run_scheduled_scrape),
         trigger=IntervalTrigger(minutes=interval_minutes),
         id='scrape_pokemon_go_news',
         name='Scrape Pokemon GO news and events',
         replace_existing=True
     )
 
-    # Get raid scraping interval from environment (default 6 hours)
-    raid_interval_hours = int(os.getenv('RAID_SCRAPE_INTERVAL', 6))
+    # Raid counters are refreshed a time slice at a time (default every 30 minutes)
+    raid_tick_minutes = int(os.getenv('RAID_REFRESH_TICK_MINUTES', 30))
 
     # Schedule raid scraping job
     scheduler.add_job(
-        func=scrape_raid_data,
-        trigger=IntervalTrigger(hours=raid_interval_hours),
+        func=leader_only(scrape_raid_data),
+        trigger=IntervalTrigger(minutes=raid_tick_minutes),
         id='scrape_raid_counters',
         name='Scrape Pokebattler raid counters',
         replace_existing=True
     )
 
+    # SQLite housekeeping (PRAGMA optimize, incremental vacuum, WAL checkpoint)
+    from models.database import engine
+    from models.sqlite_tuning import is_file_sqlite
+
+    if is_file_sqlite(engine):
+        maintenance_hours = int(os.getenv('SQLITE_MAINTENANCE_HOURS', 6))
+        scheduler.add_job(
+            func=leader_only(run_database_maintenance),
+            trigger=IntervalTrigger(hours=maintenance_hours),
+            id='sqlite_maintenance',
+            name='SQLite maintenance',
+            replace_existing=True
+        )
+
     scheduler.start()
-    print(f"Scheduler started: Will scrape news every {interval_minutes} minutes and raids every {raid_interval_hours} hours")
+    print(f"Scheduler started: Will scrape news every {interval_minutes} minutes and refresh raids every {raid_tick_minutes} minutes"
+          f" ({'leader' if scheduler_lease.is_leader else 'standby'})")
 
     return scheduler
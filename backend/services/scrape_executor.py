@@ -0,0 +1,139 @@
+"""Concurrent executor for fanning out scraper calls."""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from scrapers.http_cache import http_cache
+
+
+class ScrapeTask:
+    """A single source/kind scrape (e.g. LeekDuck events)."""
+
+    def __init__(self, source, kind, func):
+        self.source = source
+        self.kind = kind
+        self.func = func
+        self.result = []
+        self.status = 'pending'
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def key(self):
+        return self.source, self.kind
+
+    @property
+    def elapsed(self):
+        """Seconds spent running the task (so far, if still running)."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+
+class ScrapeExecutor:
+    """Run scrape tasks in parallel with a per-source limit and a cycle deadline.
+
+    Every source/kind pair runs on its own worker thread, so different
+    sources are scraped in parallel. A semaphore per source caps how many
+    of that source's tasks run at once; with the default of 1 a source's
+    events and news are scraped one after the other, so a site never gets
+    more than one scraper's requests at a time. Tasks still running when
+    the deadline passes are marked timed_out and their results discarded,
+    so a stalled source can't hold up the rest of the cycle.
+    """
+
+    def __init__(self, per_source_limit=None, deadline=None, max_workers=None):
+        self.per_source_limit = per_source_limit or int(os.getenv('SCRAPE_PER_SOURCE_CONCURRENCY', 1))
+        self.deadline = deadline or float(os.getenv('SCRAPE_CYCLE_DEADLINE', 120))
+        self.max_workers = max_workers
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore_for(self, source):
+        with self._lock:
+            if source not in self._semaphores:
+                self._semaphores[source] = threading.Semaphore(self.per_source_limit)
+            return self._semaphores[source]
+
+    def _run_task(self, task):
+        with self._semaphore_for(task.source), http_cache.task(task.key):
+            task.status = 'running'
+            task.started_at = time.monotonic()
+            try:
+                result = task.func() or []
+                if task.status == 'running':
+                    task.result = result
+                    task.status = 'done'
+            except Exception as e:
+                task.error = str(e)
+                task.status = 'failed'
+            finally:
+                task.finished_at = time.monotonic()
+        return task
+
+    def run(self, tasks, on_task_done=None):
+        """Run all tasks and return them once finished or the deadline passes."""
+        if not tasks:
+            return tasks
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers or len(tasks),
+            thread_name_prefix='scrape'
+        )
+        cycle_end = time.monotonic() + self.deadline
+
+        try:
+            pending = {executor.submit(self._run_task, task): task for task in tasks}
+            while pending:
+                remaining = cycle_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    if on_task_done:
+                        on_task_done(task)
+
+            for future, task in pending.items():
+                future.cancel()
+                task.status = 'timed_out'
+                task.result = []
+                print(f"{task.source} {task.kind}: abandoned after {self.deadline:.0f}s cycle deadline")
+        finally:
+            # Don't block on stragglers; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return tasks
+
+    @staticmethod
+    def succeeded(tasks):
+        """Keys of the tasks that finished in time and produced items."""
+        return {task.key for task in tasks if task.status == 'done' and task.result}
+
+    @staticmethod
+    def timing_report(tasks):
+        """Summarize per-source timings as a dict keyed by source name."""
+        report = {}
+        for task in tasks:
+            entry = report.setdefault(task.source, {'elapsed': 0.0, 'items': 0, 'kinds': {}})
+            entry['kinds'][task.kind] = {
+                'status': task.status,
+                'elapsed': round(task.elapsed, 2),
+                'items': len(task.result),
+                'error': task.error
+            }
+            entry['elapsed'] = round(max(entry['elapsed'], task.elapsed), 2)
+            entry['items'] += len(task.result)
+        return report
+
+    @staticmethod
+    def print_report(tasks):
+        """Print a one-line timing summary for each source/kind."""
+        for task in sorted(tasks, key=lambda t: (t.source, t.kind)):
+            line = f"  {task.source:<16} {task.kind:<7} {task.status:<9} {task.elapsed:6.2f}s  {len(task.result)} items"
+            if task.error:
+                line += f"  ({task.error})"
+            print(line)
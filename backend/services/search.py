@@ -0,0 +1,85 @@
+"""Full-text search over news and events, ranked by BM25."""
+import html
+import os
+import re
+
+from sqlalchemy import and_, func, literal_column, or_
+from sqlalchemy.sql import column, table
+
+from models.full_text_search import FTS_INDEXES
+from services.pagination import MAX_PER_PAGE
+
+MAX_TERMS = 16
+
+# Snippet highlight markers; control characters can't occur in escaped text
+MARK_START, MARK_END = '\x02', '\x03'
+
+
+def match_expression(text):
+    """Turn free text into an FTS5 MATCH expression that requires every word.
+
+    Each word is quoted so FTS syntax in user input (AND, NEAR, column:,
+    quotes) is searched for literally. The last word also matches as a
+    prefix, so "community day bulba" finds Bulbasaur.
+    """
+    terms = re.findall(r'\w+', text)[:MAX_TERMS]
+    if not terms:
+        return None
+
+    quoted = [f'"{term}"' for term in terms]
+    if len(terms[-1]) >= 2:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def highlight(snippet):
+    """HTML-escape a snippet and wrap the matched words in <mark>."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def search(db, model, args, filters, default_per_page=20):
+    """One page of model rows matching ?q=, best match first.
+
+    filters are extra SQL conditions (source, dates); ?page= and
+    ?per_page= pick the page. Returns (list of (row, snippet, relevance),
+    pagination dict). On databases without the FTS5 indexes every word is
+    matched with LIKE instead, latest added first, and snippet/relevance
+    are None.
+    """
+    text = args.get('q', '').strip()
+    page = max(args.get('page', 1, type=int), 1)
+    per_page = min(max(args.get('per_page', default_per_page, type=int), 1), MAX_PER_PAGE)
+    offset = (page - 1) * per_page
+
+    expression = match_expression(text)
+    if expression is None:
+        return [], {'page': page, 'per_page': per_page, 'has_next': False}
+
+    if db.get_bind().dialect.name == 'sqlite':
+        fts_table, columns, weights = FTS_INDEXES[model.__tablename__]
+        fts = literal_column(fts_table)
+        rank = func.bm25(fts, *weights)
+        snippet_tokens = int(os.getenv('SEARCH_SNIPPET_TOKENS', 16))
+
+        query = (
+            db.query(model, func.snippet(fts, -1, MARK_START, MARK_END, '…', snippet_tokens), rank)
+            .join(table(fts_table, column('rowid')), literal_column(f'{fts_table}.rowid') == model.id)
+            .filter(fts.op('MATCH')(expression), *filters)
+            .order_by(rank, model.id.desc())
+        )
+        rows = query.limit(per_page + 1).offset(offset).all()
+        results = [(row, highlight(snippet), round(-score, 4)) for row, snippet, score in rows]
+    else:
+        _, columns, _ = FTS_INDEXES[model.__tablename__]
+        words = re.findall(r'\w+', text)[:MAX_TERMS]
+        conditions = [
+            or_(*[getattr(model, name).ilike(f'%{word}%') for name in columns])
+            for word in words
+        ]
+        query = db.query(model).filter(and_(*conditions), *filters).order_by(model.id.desc())
+        rows = query.limit(per_page + 1).offset(offset).all()
+        results = [(row, None, None) for row in rows]
+
+    return results[:per_page], {'page': page, 'per_page': per_page, 'has_next': len(results) > per_page}
@@ -0,0 +1,121 @@
+"""Pipeline stage that upgrades fallback summaries to AI summaries concurrently."""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sqlalchemy import update
+
+
+class SummaryJob:
+    """An AI summary still owed to a saved row, identified by its URL."""
+
+    def __init__(self, model, url, kind, title, content, fallback):
+        self.model = model
+        self.url = url
+        self.kind = kind
+        self.title = title
+        self.content = content or ''
+        self.fallback = fallback
+
+
+class SummarizationStage:
+    """Run outstanding summaries in parallel and write each one back as it arrives.
+
+    Rows are saved with a fallback summary first, so this stage never holds
+    up the scrape. At most max_in_flight API calls run at once. Rate-limit,
+    overload and connection errors are retried with exponential backoff,
+    limited both per item (max_retries) and per run (retry_budget) so an
+    outage can't stretch a cycle out indefinitely.
+    """
+
+    def __init__(self, summarizer, max_in_flight=None, max_retries=None, retry_budget=None, backoff=None):
+        # The SDK retries twice on its own by default, which would multiply
+        # max_retries and retry_budget; this stage does all the retrying
+        self.summarizer = summarizer.without_retries()
+        self.max_in_flight = max_in_flight or int(os.getenv('SUMMARY_MAX_IN_FLIGHT', 4))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('SUMMARY_MAX_RETRIES', 3))
+        self.retry_budget = retry_budget if retry_budget is not None else int(os.getenv('SUMMARY_RETRY_BUDGET', 20))
+        self.backoff = backoff if backoff is not None else float(os.getenv('SUMMARY_RETRY_BACKOFF', 1.0))
+        self._budget_lock = threading.Lock()
+
+    def make_job(self, model, item, kind):
+        """Fill in the fallback summary for a scraped item and return its job."""
+        content = item.get('description' if kind == 'event' else 'content', '') or ''
+        fallback = self.summarizer.generate_fallback_summary(item.get('title', ''), content)
+        item['summary'] = fallback
+        return SummaryJob(model, item['url'], kind, item.get('title', ''), content, fallback)
+
+    @staticmethod
+    def _is_retryable(error):
+        from anthropic import APIConnectionError, APIStatusError
+
+        if isinstance(error, APIConnectionError):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code == 429 or error.status_code >= 500
+        return False
+
+    def _take_retry(self):
+        with self._budget_lock:
+            if self._retries_left <= 0:
+                return False
+            self._retries_left -= 1
+            return True
+
+    def _summarize(self, job):
+        attempt = 0
+        while True:
+            try:
+                return self.summarizer.generate_summary(job.kind, job.title, job.content)
+            except Exception as e:
+                if not self._is_retryable(e) or attempt >= self.max_retries or not self._take_retry():
+                    print(f"Error generating summary for {job.url}: {e}")
+                    return None
+                delay = self.backoff * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay / 2))
+                attempt += 1
+
+    def run(self, jobs):
+        """Summarize all jobs and upgrade their rows in place. Returns counts."""
+        from models.database import SessionLocal
+
+        stats = {'upgraded': 0, 'failed': 0}
+        if not jobs:
+            return stats
+
+        self._retries_left = self.retry_budget
+        started = time.monotonic()
+        session = SessionLocal()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='summarize') as pool:
+                futures = {pool.submit(self._summarize, job): job for job in jobs}
+
+                for future in as_completed(futures):
+                    job = futures[future]
+                    summary = future.result()
+                    if not summary:
+                        stats['failed'] += 1
+                        continue
+
+                    try:
+                        # Only replace the fallback; leave rows edited since alone
+                        session.execute(
+                            update(job.model)
+                            .where(job.model.url == job.url, job.model.summary == job.fallback)
+                            .values(summary=summary)
+                        )
+                        session.commit()
+                        stats['upgraded'] += 1
+                    except Exception as e:
+                        session.rollback()
+                        stats['failed'] += 1
+                        print(f"Error saving summary for {job.url}: {e}")
+        finally:
+            session.close()
+
+        print(f"Summaries: {stats['upgraded']} upgraded, {stats['failed']} kept fallback "
+              f"in {time.monotonic() - started:.2f}s")
+        return stats
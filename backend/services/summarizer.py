@@ -1,21 +1,71 @@
+import copy
 import os
-from anthropic import Anthropic
+from services.summary_cache import SummaryCache
 
 
 class AISummarizer:
     """AI-powered summarization service for Pokemon GO news and events."""
 
-    def __init__(self):
+    def __init__(self, cache=None):
         api_key = os.getenv('ANTHROPIC_API_KEY')
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
+
+        from anthropic import Anthropic
         self.client = Anthropic(api_key=api_key)
         # Use Claude 3 Haiku - cheaper and more widely available
         self.model = "claude-3-haiku-20240307"
+        # Shared across callers so syndicated posts are only summarized once
+        self.cache = cache or SummaryCache()
+
+    def without_retries(self):
+        """A copy of this summarizer whose API client doesn't retry failed calls."""
+        summarizer = copy.copy(self)
+        summarizer.client = self.client.with_options(max_retries=0)
+        return summarizer
 
     def summarize_event(self, title, description=""):
         """Generate a player-friendly summary for a Pokemon GO event."""
-        prompt = f"""Summarize this Pokemon GO event in 2-3 sentences for players.
+        try:
+            return self.generate_summary('event', title, description)
+        except Exception as e:
+            print(f"Error generating summary: {e}")
+            return self.generate_fallback_summary(title, description)
+
+    def summarize_news(self, title, content=""):
+        """Generate a summary for a Pokemon GO news article."""
+        try:
+            return self.generate_summary('news', title, content)
+        except Exception as e:
+            print(f"Error generating news summary: {e}")
+            return self.generate_fallback_summary(title, content)
+
+    def generate_summary(self, kind, title, content=""):
+        """Summarize an 'event' or 'news' item, raising if the API call fails."""
+        if kind == 'news':
+            content = content[:500]
+
+        cached = self.cache.get(kind, title, content)
+        if cached:
+            return cached
+
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=300,
+            messages=[{
+                "role": "user",
+                "content": self._build_summary_prompt(kind, title, content)
+            }]
+        )
+
+        summary = message.content[0].text.strip()
+        self.cache.set(kind, title, content, summary)
+        return summary
+
+    def _build_summary_prompt(self, kind, title, content):
+        """Build the summarization prompt for an event or news item."""
+        if kind == 'event':
+            return f"""Summarize this Pokemon GO event in 2-3 sentences for players.
 Focus on:
 - Event dates (if mentioned)
 - Featured Pokemon
@@ -23,54 +73,18 @@ Focus on:
 - Key activities or what players should do
 
 Event Title: {title}
-Event Description: {description}
+Event Description: {content}
 
 Provide a clear, concise summary that helps players quickly understand what this event is about and what they should know."""
 
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            summary = message.content[0].text.strip()
-            return summary
-
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            return self._generate_fallback_summary(title, description)
-
-    def summarize_news(self, title, content=""):
-        """Generate a summary for a Pokemon GO news article."""
-        prompt = f"""Summarize this Pokemon GO news in 2-3 sentences.
+        return f"""Summarize this Pokemon GO news in 2-3 sentences.
 Focus on the key information that players need to know.
 
 Title: {title}
-Content: {content[:500]}
+Content: {content}
 
 Provide a clear, concise summary."""
 
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=300,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            summary = message.content[0].text.strip()
-            return summary
-
-        except Exception as e:
-            print(f"Error generating news summary: {e}")
-            return self._generate_fallback_summary(title, content)
-
     def identify_event_type(self, title, description=""):
         """Use AI to identify the type of Pokemon GO event."""
         prompt = f"""What type of Pokemon GO event is this? Choose ONE from:
@@ -105,7 +119,7 @@ Respond with only the event type name."""
             print(f"Error identifying event type: {e}")
             return "Special Event"
 
-    def _generate_fallback_summary(self, title, content):
+    def generate_fallback_summary(self, title, content):
         """Generate a simple fallback summary without AI."""
         if content:
             # Take first 150 characters of content as summary
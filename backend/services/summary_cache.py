@@ -0,0 +1,114 @@
+"""Persistent cache of AI summaries keyed by normalized content."""
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+
+class SummaryCache:
+    """Database-backed summary cache with a TTL and a size bound.
+
+    Entries are keyed by a hash of (prompt kind, title, content) after
+    collapsing case and whitespace, so the same announcement syndicated
+    under different URLs only costs one LLM call. The least recently used
+    entries are evicted once the cache grows past max_entries.
+    """
+
+    def __init__(self, ttl_days=None, max_entries=None):
+        self.ttl = timedelta(days=ttl_days or float(os.getenv('SUMMARY_CACHE_TTL_DAYS', 30)))
+        self.max_entries = max_entries or int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', 5000))
+
+    @staticmethod
+    def _normalize(text):
+        return ' '.join((text or '').lower().split())
+
+    @classmethod
+    def make_key(cls, kind, title, content):
+        """Hash the normalized prompt inputs into a cache key."""
+        raw = '\x1f'.join([kind, cls._normalize(title), cls._normalize(content)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, kind, title, content):
+        """Return a cached summary, or None on a miss or expired entry."""
+        from models.database import SessionLocal, SummaryCacheEntry
+
+        key = self.make_key(kind, title, content)
+        session = SessionLocal()
+        try:
+            entry = session.query(SummaryCacheEntry).filter_by(cache_key=key).first()
+            if not entry:
+                return None
+            now = datetime.utcnow()
+            if entry.created_date and entry.created_date < now - self.ttl:
+                return None
+            entry.last_used_date = now
+            summary = entry.summary
+            session.commit()
+            return summary
+        except Exception as e:
+            session.rollback()
+            print(f"Error reading summary cache: {e}")
+            return None
+        finally:
+            session.close()
+
+    def set(self, kind, title, content, summary):
+        """Store or refresh a summary."""
+        from models.database import SessionLocal, SummaryCacheEntry
+
+        key = self.make_key(kind, title, content)
+        now = datetime.utcnow()
+        session = SessionLocal()
+        try:
+            entry = session.query(SummaryCacheEntry).filter_by(cache_key=key).first()
+            if entry:
+                entry.summary = summary
+                entry.created_date = now
+                entry.last_used_date = now
+            else:
+                session.add(SummaryCacheEntry(
+                    cache_key=key,
+                    kind=kind,
+                    summary=summary,
+                    created_date=now,
+                    last_used_date=now
+                ))
+            session.commit()
+        except IntegrityError:
+            # Another worker stored the same key first; its summary is as good
+            session.rollback()
+        except Exception as e:
+            session.rollback()
+            print(f"Error writing summary cache: {e}")
+        finally:
+            session.close()
+
+    def prune(self):
+        """Drop expired entries and evict the least recently used beyond max_entries."""
+        from models.database import SessionLocal, SummaryCacheEntry
+
+        session = SessionLocal()
+        try:
+            expired = session.execute(
+                delete(SummaryCacheEntry).where(
+                    SummaryCacheEntry.created_date < datetime.utcnow() - self.ttl
+                )
+            ).rowcount
+
+            overflow_ids = select(SummaryCacheEntry.id).order_by(
+                SummaryCacheEntry.last_used_date.desc()
+            ).offset(self.max_entries).scalar_subquery()
+            evicted = session.execute(
+                delete(SummaryCacheEntry).where(SummaryCacheEntry.id.in_(overflow_ids))
+            ).rowcount
+
+            session.commit()
+            if expired or evicted:
+                print(f"Summary cache pruned: {expired} expired, {evicted} evicted")
+        except Exception as e:
+            session.rollback()
+            print(f"Error pruning summary cache: {e}")
+        finally:
+            session.close()
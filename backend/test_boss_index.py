@@ -0,0 +1,48 @@
+"""Check how the boss name index resolves other spellings and typos.
+
+Run with `python -m pytest test_boss_index.py`.
+"""
+from types import SimpleNamespace
+
+from services.boss_index import BossNameIndex
+
+
+def _index(names, known_names=()):
+    index = BossNameIndex()
+    index.rebuild(
+        [SimpleNamespace(id=i, name=name, tier='5', is_active=True, types=None) for i, name in enumerate(names)],
+        known_names
+    )
+    return index
+
+
+def _resolved(index, name):
+    resolved = index.resolve(name)
+    return (resolved[0]['name'], resolved[1]) if resolved else None
+
+
+def test_other_spellings_resolve():
+    index = _index(['Giratina (Origin Forme)', 'Primal Groudon'])
+
+    assert _resolved(index, 'giratina-origin') == ('Giratina (Origin Forme)', 'normalized')
+    assert _resolved(index, 'Groudon Primal') == ('Primal Groudon', 'normalized')
+
+
+def test_typo_resolves_to_unique_closest_boss():
+    index = _index(['Giratina (Origin Forme)', 'Latios'])
+
+    assert _resolved(index, 'Girtina Origin') == ('Giratina (Origin Forme)', 'fuzzy')
+    assert _resolved(index, 'Latois') == ('Latios', 'fuzzy')
+
+
+def test_known_pokemon_is_not_a_typo():
+    index = _index(['Latios'], known_names=['Latias', 'Shadow Mamoswine'])
+
+    assert _resolved(index, 'Latias') is None
+    assert _resolved(index, 'Shadow Latias') is None
+
+
+def test_tied_typo_is_not_resolved():
+    index = _index(['Abcdx', 'Abcdy'])
+
+    assert _resolved(index, 'Abcdz') is None
@@ -0,0 +1,61 @@
+"""Check the counts and row changes reconcile_counters makes against stored counters.
+
+Run with `python -m pytest test_counter_reconciler.py`.
+"""
+from models.database import RaidBoss, RaidCounter
+from services.counter_reconciler import reconcile_counters
+
+
+def _counter(name, rank, dps, fast_move='Quick', charge_move='Charged'):
+    return {'pokemon_name': name, 'fast_move': fast_move, 'charge_move': charge_move, 'rank': rank, 'dps': dps}
+
+
+def _boss(db, name, counters):
+    boss = RaidBoss(name=name, tier='5')
+    db.add(boss)
+    db.flush()
+    for counter in counters:
+        db.add(RaidCounter(raid_boss_id=boss.id, **counter))
+    db.commit()
+    return boss
+
+
+def _stored(db, boss_id):
+    db.expire_all()
+    return {(c.pokemon_name, c.rank, c.dps) for c in db.query(RaidCounter).filter_by(raid_boss_id=boss_id)}
+
+
+def test_reconcile_counts_each_change(db):
+    boss = _boss(db, 'Rayquaza', [
+        _counter('Mamoswine', 1, 20.0),
+        _counter('Rhyperior', 2, 18.0),
+        _counter('Glaceon', 3, 15.0)
+    ])
+    changes = reconcile_counters(db, boss.id, [
+        _counter('Mamoswine', 1, 20.0),   # unchanged
+        _counter('Rhyperior', 2, 18.5),   # updated
+        _counter('Weavile', 3, 16.0),     # inserted; Glaceon deleted
+        _counter('Weavile', 3, 16.0)      # repeated in the scrape, ignored
+    ])
+    db.commit()
+
+    assert changes == {'inserted': 1, 'updated': 1, 'deleted': 1, 'unchanged': 1}
+    assert _stored(db, boss.id) == {('Mamoswine', 1, 20.0), ('Rhyperior', 2, 18.5), ('Weavile', 3, 16.0)}
+
+
+def test_reconcile_matches_on_moveset(db):
+    boss = _boss(db, 'Kyogre', [_counter('Zekrom', 1, 19.0, charge_move='Wild Charge')])
+    changes = reconcile_counters(db, boss.id, [_counter('Zekrom', 1, 19.0, charge_move='Fusion Bolt')])
+    db.commit()
+
+    assert changes == {'inserted': 1, 'updated': 0, 'deleted': 1, 'unchanged': 0}
+
+
+def test_reconcile_empty_scrape_keeps_counters(db):
+    boss = _boss(db, 'Groudon', [_counter('Kyogre', 1, 21.0), _counter('Kingler', 2, 17.0)])
+    changes = reconcile_counters(db, boss.id, [])
+    db.commit()
+
+    assert changes == {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    assert _stored(db, boss.id) == {('Kyogre', 1, 21.0), ('Kingler', 2, 17.0)}
+
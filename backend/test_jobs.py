@@ -0,0 +1,105 @@
+"""Check that jobs recorded in the job store are shared across job runners.
+
+Two JobRunners on one database stand in for two worker processes.
+
+Run with `python -m pytest test_jobs.py`.
+"""
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.database import BackgroundJob
+from services.jobs import Job, JobRunner, JobStore
+
+
+@pytest.fixture
+def make_store(session_factory):
+    """JobStores on the test database; each one stands in for a worker process."""
+    def store(**options):
+        options.setdefault('poll_interval', 0.05)
+        return JobStore(session_factory=session_factory, **options)
+    return store
+
+
+def test_job_is_shared_between_runners(make_store):
+    first, second = JobRunner('first', store=make_store()), JobRunner('second', store=make_store())
+    release = threading.Event()
+
+    def work(job, value):
+        job.update_progress(stage='working')
+        release.wait(5)
+        return {'value': value}
+
+    job, created = first.submit('shared', work, value=7)
+    other, other_created = second.submit('shared', work, value=8)
+
+    assert created and not other_created
+    assert other.id == job.id
+    assert second.get(job.id).is_active
+    assert second.active_job('shared').id == job.id
+
+    release.set()
+    assert other.wait(5)
+    assert other.status == 'succeeded'
+    assert other.result == {'value': 7}
+    assert second.get(job.id).to_dict()['result'] == {'value': 7}
+
+    # Finished jobs no longer block new ones
+    job, created = second.submit('shared', work, value=9)
+    assert created and job.wait(5)
+
+
+def test_failed_job_is_recorded(make_store):
+    runner = JobRunner('failing', store=make_store())
+
+    def work(job):
+        raise ValueError('scrape broke')
+
+    job, _ = runner.submit('failing', work)
+    job.wait(5)
+    stored = make_store().load(job.id)
+    assert stored.status == 'failed'
+    assert stored.error == 'scrape broke'
+
+
+def test_stale_job_is_abandoned(db, make_store):
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    db.add(BackgroundJob(id='dead', kind='stale', active_kind='stale', status='running',
+                         created_date=long_ago, heartbeat_date=long_ago))
+    db.commit()
+
+    job, created = JobRunner('stale', store=make_store(stale_after=60)).submit('stale', lambda job: 'done')
+
+    assert created and job.wait(5)
+    dead = make_store().load('dead')
+    assert dead.status == 'failed'
+    assert dead.error.startswith('Abandoned')
+
+
+def test_progress_snapshot_while_updating():
+    job = Job('progress', None)
+    stop = threading.Event()
+
+    def update():
+        i = 0
+        while not stop.is_set():
+            job.update_progress('sources', f'source {i % 500}', events={'items': i})
+            i += 1
+
+    writer = threading.Thread(target=update)
+    writer.start()
+    try:
+        # Serializing while the writer adds sources must never fail
+        snapshots = [json.loads(job.progress_json()) for _ in range(200)]
+    finally:
+        stop.set()
+        writer.join()
+
+    assert len(snapshots[-1]['sources']) >= len(snapshots[0].get('sources', {}))
+
+
+def test_unknown_job(make_store):
+    assert JobRunner('unknown', store=make_store()).get('missing') is None
+
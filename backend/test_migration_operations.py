@@ -0,0 +1,103 @@
+"""Check the migration building blocks against a throwaway SQLite database.
+
+Each operation must do its work once and be a no-op when run again, since
+an interrupted migration is simply re-run.
+
+Run with `python -m pytest test_migration_operations.py`.
+"""
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, insert, inspect, select, text
+
+from models.migrations.operations import (
+    add_column, create_index, drop_index, execute_in_id_ranges, existing_indexes, update_in_batches
+)
+
+def _bosses_table(metadata, *extra_columns):
+    return Table(
+        'bosses', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100), nullable=False),
+        *extra_columns
+    )
+
+
+def _old_bosses(engine):
+    """Create the table as an older release did, with ten rows; return it as the models now declare it."""
+    old_table = _bosses_table(MetaData())
+    old_table.create(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(old_table), [{'name': f'Boss {i}'} for i in range(10)])
+
+    return _bosses_table(
+        MetaData(),
+        Column('slug', String(100)),
+        Column('tier', String(20), server_default='5')
+    )
+
+
+def test_add_column(empty_engine):
+    engine = empty_engine
+    table = _old_bosses(engine)
+
+    assert add_column(engine, table, 'slug')
+    assert add_column(engine, table, 'tier')
+    assert not add_column(engine, table, 'slug')
+
+    columns = {column['name'] for column in inspect(engine).get_columns('bosses')}
+    assert {'slug', 'tier'} <= columns
+    with engine.connect() as connection:
+        assert set(connection.execute(select(table.c.tier)).scalars()) == {'5'}
+
+
+def test_update_in_batches(empty_engine):
+    engine = empty_engine
+    table = _old_bosses(engine)
+    add_column(engine, table, 'slug')
+
+    def compute(row):
+        # Leave one row for the re-run to find
+        if row.name == 'Boss 9':
+            return None
+        return {'slug': row.name.lower().replace(' ', '-')}
+
+    missing = table.c.slug.is_(None)
+    assert update_in_batches(engine, table, compute, [table.c.name], where=missing, batch_size=3, pause=0) == 9
+    assert update_in_batches(engine, table, compute, [table.c.name], where=missing, batch_size=3, pause=0) == 0
+
+    with engine.connect() as connection:
+        slugs = dict(connection.execute(select(table.c.name, table.c.slug)).all())
+    assert slugs['Boss 0'] == 'boss-0'
+    assert slugs['Boss 9'] is None
+
+
+def test_execute_in_id_ranges(empty_engine):
+    engine = empty_engine
+    table = _old_bosses(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE boss_names (id INTEGER PRIMARY KEY, name VARCHAR(100))')
+
+    ranges = execute_in_id_ranges(
+        engine, table,
+        'INSERT INTO boss_names (id, name) SELECT id, name FROM bosses WHERE id >= :low AND id < :high',
+        batch_size=4, pause=0
+    )
+
+    assert ranges == 3
+    with engine.connect() as connection:
+        assert connection.execute(text('SELECT COUNT(*) FROM boss_names')).scalar() == 10
+
+
+def test_create_and_drop_index(empty_engine):
+    engine = empty_engine
+    table = _old_bosses(engine)
+    index = Index('idx_bosses_name', table.c.name)
+
+    assert create_index(engine, index)
+    assert not create_index(engine, index)
+    with engine.connect() as connection:
+        assert 'idx_bosses_name' in existing_indexes(connection, 'bosses')
+
+    assert drop_index(engine, 'bosses', 'idx_bosses_name')
+    assert not drop_index(engine, 'bosses', 'idx_bosses_name')
+    with engine.connect() as connection:
+        assert 'idx_bosses_name' not in existing_indexes(connection, 'bosses')
+
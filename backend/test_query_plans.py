@@ -0,0 +1,180 @@
+"""Check that the hot API queries are served by indexes, not full table scans.
+
+Builds a throwaway SQLite database with the app's schema and some data,
+runs each route's query builder, and inspects EXPLAIN QUERY PLAN for every
+statement it issued. A plan that scans a whole table or index, or sorts a
+listing in a temporary B-tree instead of reading it in index order, fails.
+
+Run with `python -m pytest test_query_plans.py`.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from werkzeug.datastructures import MultiDict
+
+from models.database import NewsItem, Event, RaidBoss, RaidCounter
+from routes.news import build_news_query, NEWS_SORT_KEYS
+from routes.events import build_events_query, build_calendar_query, EVENT_SORT_KEYS
+from routes.raids import build_raids_query, find_raid_boss, build_counters_query, RAID_SORT_KEYS
+from services.pagination import keyset_paginate
+from services.persistence import find_existing_urls
+from services.search import search
+
+# A whole table, or a whole index walked from end to end
+FULL_SCAN = re.compile(r'^SCAN (\w+)( USING (COVERING )?INDEX \w+)?$')
+SOURCES = ['LeekDuck', 'Official Blog', 'Silph Road', 'Serebii', 'Pokemon GO Hub']
+EVENT_TYPES = ['Community Day', 'Raid Hour', 'Spotlight Hour', 'Event']
+
+
+def fill_database(engine):
+    """Fill a database that has the app's schema with sample rows."""
+    session = sessionmaker(bind=engine)()
+
+    base = datetime(2026, 1, 1)
+    for i in range(3000):
+        session.add(NewsItem(
+            title=f'News {i}', source=SOURCES[i % len(SOURCES)], url=f'https://example.com/news/{i}',
+            published_date=None if i % 50 == 0 else base + timedelta(hours=i),
+            scraped_date=base + timedelta(hours=i, minutes=5)
+        ))
+        start = base + timedelta(hours=i * 3)
+        session.add(Event(
+            title=f'Event {i}', event_type=EVENT_TYPES[i % len(EVENT_TYPES)], source=SOURCES[i % len(SOURCES)],
+            url=f'https://example.com/events/{i}', start_date=None if i % 50 == 0 else start,
+            end_date=start + timedelta(days=1), scraped_date=base
+        ))
+
+    for i in range(300):
+        boss = RaidBoss(name=f'Boss {i}', tier=str(i % 6 + 1), is_active=i % 3 == 0)
+        session.add(boss)
+        session.flush()
+        for rank in range(1, 31):
+            session.add(RaidCounter(raid_boss_id=boss.id, pokemon_name=f'Counter {rank}', rank=rank))
+
+    session.commit()
+    session.close()
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql('ANALYZE')
+
+
+class QueryRecorder:
+    """Collects the SELECT statements an engine runs."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        event.listen(engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.statements.append((statement, parameters))
+
+    def plans(self):
+        """EXPLAIN QUERY PLAN details for each recorded statement."""
+        recorded, self.statements = self.statements, []
+        results = []
+        with self.engine.connect() as connection:
+            for statement, parameters in recorded:
+                rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+                results.append((statement, [row[3] for row in rows]))
+        return results
+
+
+def assert_indexed(recorder, ordered=True):
+    """Fail on any full table scan (or, for ordered listings, any sort step)."""
+    plans = recorder.plans()
+    assert plans, 'no queries were recorded'
+
+    for statement, details in plans:
+        for detail in details:
+            assert not FULL_SCAN.match(detail), f'full table scan ({detail}) for:\n{statement}'
+            if ordered:
+                assert 'USE TEMP B-TREE FOR ORDER BY' not in detail, f'sort not served by an index for:\n{statement}'
+
+
+@pytest.fixture(scope='module')
+def sample_db(module_engine):
+    """A session on the module's database, filled once with sample rows."""
+    fill_database(module_engine)
+    session = sessionmaker(bind=module_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope='module')
+def recorder(module_engine, sample_db):
+    return QueryRecorder(module_engine)
+
+
+def walk_pages(query, sort_keys, per_page=20, pages=3):
+    """Fetch a few pages forwards by cursor, then one page back."""
+    page, pagination = keyset_paginate(query, sort_keys, per_page)
+    for _ in range(pages - 1):
+        page, pagination = keyset_paginate(query, sort_keys, per_page, pagination['next_cursor'])
+    keyset_paginate(query, sort_keys, per_page, pagination['prev_cursor'])
+
+
+def test_news_listing_uses_index(sample_db, recorder):
+    db = sample_db
+    for args in ({}, {'source': 'Serebii'}):
+        query, _ = build_news_query(db, MultiDict(args))
+        walk_pages(query, NEWS_SORT_KEYS)
+        assert_indexed(recorder)
+
+
+def test_news_listing_past_null_dates_uses_index(sample_db, recorder):
+    db = sample_db
+    query, _ = build_news_query(db, MultiDict())
+    # Small pages straddle the boundary into the undated rows
+    walk_pages(query, NEWS_SORT_KEYS, per_page=500, pages=7)
+    assert_indexed(recorder)
+
+
+def test_events_listing_uses_index(sample_db, recorder):
+    db = sample_db
+    for args in ({}, {'type': 'Raid Hour'}, {'source': 'LeekDuck'}):
+        query, _ = build_events_query(db, MultiDict(args))
+        walk_pages(query, EVENT_SORT_KEYS)
+        assert_indexed(recorder)
+
+
+def test_events_calendar_uses_index(sample_db, recorder):
+    build_calendar_query(sample_db, 2026, 3).all()
+    assert_indexed(recorder)
+
+
+def test_raids_listing_uses_index(sample_db, recorder):
+    db = sample_db
+    for args in ({}, {'active': 'true'}):
+        query, _ = build_raids_query(db, MultiDict(args))
+        walk_pages(query, RAID_SORT_KEYS)
+        assert_indexed(recorder)
+
+
+def test_boss_counters_use_index(sample_db, recorder):
+    db = sample_db
+    boss, _ = find_raid_boss(db, 'boss 42')
+    assert boss is not None
+    build_counters_query(db, boss.id, MultiDict()).limit(20).all()
+    assert_indexed(recorder)
+
+
+def test_url_dedup_uses_index(sample_db, recorder):
+    db = sample_db
+    find_existing_urls(db, NewsItem, [f'https://example.com/news/{i}' for i in range(0, 3000, 7)])
+    find_existing_urls(db, Event, [f'https://example.com/events/{i}' for i in range(0, 3000, 7)])
+    assert_indexed(recorder, ordered=False)
+
+
+def test_search_uses_full_text_index(sample_db, recorder):
+    db = sample_db
+    results, _ = search(db, NewsItem, MultiDict({'q': 'news 12'}), [NewsItem.source == 'Serebii'])
+    assert results, 'full-text search found nothing'
+    search(db, Event, MultiDict({'q': 'event'}), [Event.event_type == 'Raid Hour'])
+    # Results are ranked, so the sort step is expected
+    assert_indexed(recorder, ordered=False)
+
@@ -0,0 +1,52 @@
+"""Check that raid ingestion keeps stored data when a scrape comes back empty.
+
+Run with `python -m pytest test_raid_ingestion.py`.
+"""
+from datetime import datetime
+
+from models.database import RaidBoss, RaidCounter
+from services.raid_ingestion import ingest_raid_entries
+
+LAST_UPDATED = datetime(2026, 1, 1)
+
+
+def _boss_with_counters(db, name):
+    boss = RaidBoss(name=name, tier='5', is_active=True, last_updated=LAST_UPDATED)
+    db.add(boss)
+    db.flush()
+    for rank in range(1, 4):
+        db.add(RaidCounter(raid_boss_id=boss.id, pokemon_name=f'Counter {rank}', rank=rank, dps=10.0 + rank))
+    db.commit()
+    return boss
+
+
+def test_empty_scrape_keeps_boss_and_counters(db):
+    boss = _boss_with_counters(db, 'Kyogre')
+    result = ingest_raid_entries(db, [{'boss_data': {'name': 'Kyogre', 'tier': '5'}, 'counters': []}])
+    db.commit()
+
+    assert result == (0, 0, 0)
+    db.expire_all()
+    assert db.get(RaidBoss, boss.id).last_updated == LAST_UPDATED
+    assert db.query(RaidCounter).filter_by(raid_boss_id=boss.id).count() == 3
+
+
+def test_empty_scrape_does_not_add_boss(db):
+    result = ingest_raid_entries(db, [{'boss_data': {'name': 'Unknown', 'tier': '1'}}])
+    db.commit()
+
+    assert result == (0, 0, 0)
+    assert db.query(RaidBoss).filter_by(name='Unknown').count() == 0
+
+
+def test_scrape_with_counters_updates_boss(db):
+    boss = _boss_with_counters(db, 'Groudon')
+    counters = [{'pokemon_name': 'Kyogre', 'rank': 1, 'dps': 20.0}]
+    result = ingest_raid_entries(db, [{'boss_data': {'name': 'Groudon', 'tier': '5'}, 'counters': counters}])
+    db.commit()
+
+    # One counter inserted, the three old ones deleted
+    assert result == (0, 1, 4)
+    db.expire_all()
+    assert db.get(RaidBoss, boss.id).last_updated > LAST_UPDATED
+    assert [c.pokemon_name for c in db.query(RaidCounter).filter_by(raid_boss_id=boss.id)] == ['Kyogre']
@@ -11,6 +11,7 @@ const EventsList = () => {
     types: [],
     source: '',
     page: 1,
+    cursor: null,
   });
   const [pagination, setPagination] = useState(null);
 
@@ -25,10 +26,14 @@ const EventsList = () => {
 
     try {
       const params = {
-        page: filters.page,
+        include_total: true,
         per_page: 12,
       };
 
+      if (filters.cursor) {
+        params.cursor = filters.cursor;
+      }
+
       if (filters.source) {
         params.source = filters.source;
       }
@@ -63,11 +68,14 @@ const EventsList = () => {
   };
 
   const handleFilterChange = (newFilters) => {
-    setFilters({ ...filters, ...newFilters, page: 1 });
+    setFilters({ ...filters, ...newFilters, page: 1, cursor: null });
   };
 
-  const handlePageChange = (newPage) => {
-    setFilters({ ...filters, page: newPage });
+  // Pages are fetched by cursor; the page number is only for display
+  const handlePageChange = (direction) => {
+    const cursor = direction === 'next' ? pagination.next_cursor : pagination.prev_cursor;
+    const page = direction === 'next' ? filters.page + 1 : Math.max(filters.page - 1, 1);
+    setFilters({ ...filters, page, cursor });
     window.scrollTo({ top: 0, behavior: 'smooth' });
   };
 
@@ -120,23 +128,23 @@ const EventsList = () => {
           )}
 
           {/* Pagination */}
-          {pagination && pagination.pages > 1 && (
+          {pagination && (pagination.has_next || pagination.has_prev) && (
             <div className="flex justify-center items-center gap-2 mt-8">
               <button
-                onClick={() => handlePageChange(filters.page - 1)}
-                disabled={filters.page === 1}
+                onClick={() => handlePageChange('prev')}
+                disabled={!pagination.has_prev}
                 className="px-4 py-2 bg-pogo-blue text-white rounded-lg disabled:bg-gray-300 disabled:cursor-not-allowed hover:bg-pogo-red transition-colors"
               >
                 Previous
               </button>
 
               <span className="text-gray-700 px-4">
-                Page {filters.page} of {pagination.pages}
+                Page {filters.page}{pagination.pages ? ` of ${pagination.pages}` : ''}
               </span>
 
               <button
-                onClick={() => handlePageChange(filters.page + 1)}
-                disabled={filters.page === pagination.pages}
+                onClick={() => handlePageChange('next')}
+                disabled={!pagination.has_next}
                 className="px-4 py-2 bg-pogo-blue text-white rounded-lg disabled:bg-gray-300 disabled:cursor-not-allowed hover:bg-pogo-red transition-colors"
               >
                 Next
@@ -40,6 +40,15 @@ export const newsAPI = {
     }
   },
 
+  search: async (q, params = {}) => {
+    try {
+      const response = await api.get('/api/news/search', { params: { ...params, q } });
+      return response.data;
+    } catch (error) {
+      throw error;
+    }
+  },
+
   getSources: async () => {
     try {
       const response = await api.get('/api/news/sources');
@@ -61,6 +70,15 @@ export const eventsAPI = {
     }
   },
 
+  search: async (q, params = {}) => {
+    try {
+      const response = await api.get('/api/events/search', { params: { ...params, q } });
+      return response.data;
+    } catch (error) {
+      throw error;
+    }
+  },
+
   getById: async (id) => {
     try {
       const response = await api.get(`/api/events/${id}`);
@@ -137,6 +155,15 @@ export const raidsAPI = {
       throw error;
     }
   },
+
+  getRefreshStatus: async (jobId) => {
+    try {
+      const response = await api.get(`/api/raids/refresh/${jobId}`);
+      return response.data;
+    } catch (error) {
+      throw error;
+    }
+  },
 };
 
 // Assistant API calls
@@ -192,6 +219,15 @@ export const adminAPI = {
     }
   },
 
+  getScrapeStatus: async (jobId) => {
+    try {
+      const response = await api.get(`/api/scrape/${jobId}`);
+      return response.data;
+    } catch (error) {
+      throw error;
+    }
+  },
+
   healthCheck: async () => {
     try {
       const response = await api.get('/api/health');